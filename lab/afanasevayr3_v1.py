@@ -2,6 +2,11 @@ import itertools
 import random
 import numpy as np
 import matplotlib.pyplot as plt
+from combinatorics import CHUNK_SIZE, chunked, permutation_chunks, combination_chunks
+from permutation_engine import heap_permutations
+from constrained import constrained_combinations
+from counting import count_permutations, count_combinations, count_constrained
+from routes import solve_route
 
 def task1(elements: list):
     return list(itertools.permutations(elements))
@@ -10,28 +15,23 @@ def task2(elements: list, k: int):
     return list(itertools.combinations(elements, k))
 
 def task3(elements: list):
-    def backtrack(path, used, result):
-        if len(path) == len(elements):
-            result.append(tuple(path))
-            return
-        for i in range(len(elements)):
-            if not used[i]:
-                used[i] = True
-                path.append(elements[i])
-                backtrack(path, used, result)
-                path.pop()
-                used[i] = False
-    result = []
-    backtrack([], [False] * len(elements), result)
-    return result
+    # алгоритм Хипа: каждая следующая перестановка - один обмен в общем буфере
+    return list(heap_permutations(elements))
+
+def task1_stream(elements: list, chunk_size: int = CHUNK_SIZE, start: int = 0, stop: int = None):
+    # перестановки с номерами start..stop-1 блоками по chunk_size, без списка всех перестановок
+    return permutation_chunks(elements, chunk_size, start, stop)
+
+def task2_stream(elements: list, k: int, chunk_size: int = CHUNK_SIZE, start: int = 0, stop: int = None):
+    return combination_chunks(elements, k, chunk_size, start, stop)
+
+def task3_stream(elements: list, chunk_size: int = CHUNK_SIZE, start: int = 0, stop: int = None):
+    # тот же порядок Хипа, что у task3; ранга в этом порядке нет - первые start пропускаются перебором
+    return chunked(itertools.islice(heap_permutations(elements), start, stop), chunk_size)
 
 def task4(elements: list, k: int, max_sum: float = None):
-    all_combinations = task2(elements, k)
-    if max_sum is not None:
-        filtered = [comb for comb in all_combinations if sum(comb) <= max_sum]
-        return filtered
-    
-    return all_combinations
+    # ветви, в которых сумма заведомо превысит max_sum, отсекаются при построении
+    return list(constrained_combinations(elements, k, max_sum=max_sum))
 
 def task5(n: int, k: int, m: int = 1000):
     successful_cases = 0
@@ -75,7 +75,7 @@ test_elements_constrained = [1, 2, 3, 4, 5]
 constrained_combs = task4(test_elements_constrained, 3, max_sum=8)
 print(f"Элементы: {test_elements_constrained}")
 print(f"Сочетания из 3 элементов с суммой ≤ 8: {constrained_combs}")
-print(f"Количество: {len(constrained_combs)}")
+print(f"Количество: {count_constrained(test_elements_constrained, 3, max_sum=8)}")
 
 print("\nПрактическое задание 5:")
 prob, distributions = task5(10, 3, 1000)
@@ -112,14 +112,14 @@ symbols1 = ['–', '.']
 words_length2 = [''.join(p) for p in itertools.permutations(symbols1, 2)]
 print(f"Символы: {symbols1}")
 print(f"Все слова длины 2: {words_length2}")
-print(f"Количество слов: {len(words_length2)}")
+print(f"Количество слов: {count_permutations(len(symbols1), 2)}")
 
 print("\nЗадача 2:")
 letters = ['A', 'B', 'C']
 comb_2_letters = task2(letters, 2)
 print(f"Буквы: {letters}")
 print(f"Комбинации из 2 букв: {comb_2_letters}")
-print(f"Количество комбинаций: {len(comb_2_letters)}")
+print(f"Количество комбинаций: {count_combinations(len(letters), 2)}")
 
 print("\nЗадача 3:")
 landmarks = ['A', 'B', 'C', 'D']
@@ -130,38 +130,22 @@ distance_matrix = [
     [6, 3, 12, 0]
 ]
 
-routes = []
-for perm in task3(landmarks[1:]):
-    route = ['A'] + list(perm) + ['A']
-    routes.append(route)
-
-route_distances = []
-for route in routes:
-    total_distance = 0
-    for i in range(len(route)-1):
-        from_idx = landmarks.index(route[i])
-        to_idx = landmarks.index(route[i+1])
-        total_distance += distance_matrix[from_idx][to_idx]
-    route_distances.append((route, total_distance))
-
-min_route = min(route_distances, key=lambda x: x[1])
+# Held-Karp вместо перебора всех (n-1)! маршрутов
+distance, order, _ = solve_route(np.array(distance_matrix), start=0)
+min_route = ([landmarks[i] for i in order], distance)
 print(f"Достопримечательности: {landmarks}")
-print(f"Всего маршрутов: {len(routes)}")
+print(f"Всего маршрутов: {count_permutations(len(landmarks) - 1)}")
 print(f"Самый короткий маршрут: {min_route[0]} - {min_route[1]} км")
 
 print("\nЗадача 4:")
 employees = ['A', 'B', 'C', 'D', 'E']
 
-def valid_committee(committee):
-    return not ('A' in committee and 'B' in committee)
-
-all_committees = task2(employees, 3)
-valid_committees = [comm for comm in all_committees if valid_committee(comm)]
+valid_committees = list(constrained_combinations(employees, 3, apart=[('A', 'B')]))
 
 print(f"Сотрудники: {employees}")
-print(f"Все комитеты из 3 человек: {len(all_committees)}")
+print(f"Все комитеты из 3 человек: {count_combinations(len(employees), 3)}")
 print(f"Допустимые комитеты (A и B не вместе): {valid_committees}")
-print(f"Количество допустимых комитетов: {len(valid_committees)}")
+print(f"Количество допустимых комитетов: {count_constrained(employees, 3, apart=[('A', 'B')])}")
 
 print("\nЗадача 5:")
 print("367 человек и 365 дней в году")
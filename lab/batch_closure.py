@@ -0,0 +1,107 @@
+"""Пакетный режим: замыкания и свойства для многих отношений без диалога.
+
+Вход - файлы .npy (матрица 0/1) или текстовые списки пар "x y" (1..n, '#' - комментарий).
+Для каждого входа пишется <out>/<имя>.npz: n, упакованные строки каждого
+замыкания (uint64, как в BitRelation) и вектор свойств в порядке PROPERTIES.
+
+    python batch_closure.py rel/*.npy rel/*.txt -c transitive reflexive -p reflexive transitive -o out -w 8
+
+-p без имён проверяет все свойства, без -p свойства не проверяются.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from bitrel import BitRelation
+from closure import CLOSURES
+from properties import PROPERTIES, relation_properties
+
+PROPERTY_NAMES = {  # имена свойств в командной строке -> ключи PROPERTIES
+    'reflexive': 'рефлексивное',
+    'irreflexive': 'антирефлексивное',
+    'symmetric': 'симметричное',
+    'antisymmetric': 'антисимметричное',
+    'transitive': 'транзитивное'
+}
+
+
+def load_relation(path, n=None):
+    """Чтение отношения с диска в BitRelation"""
+    if path.endswith('.npy'):
+        return BitRelation.from_matrix(np.load(path))
+    pairs = np.loadtxt(path, dtype=np.int64, comments='#', ndmin=2).reshape(-1, 2)
+    if n is None:
+        n = int(pairs.max()) if pairs.size else 0
+    rel = BitRelation(n)
+    ok = (pairs >= 1).all(axis=1) & (pairs <= n).all(axis=1)  # как в BitRelation.from_pairs
+    rel.set_bits(pairs[ok, 0] - 1, pairs[ok, 1] - 1)
+    return rel
+
+
+def process_relation(path, closures, properties, out_dir, n=None):
+    """Работа одного процесса: чтение, замыкания, свойства, запись результата.
+    properties - ключи PROPERTIES для проверки (пусто - не проверять)"""
+    rel = load_relation(path, n)
+    result = {'n': np.int64(rel.n)}
+    for name in closures:
+        result[name] = CLOSURES[name](rel).words
+    props = {}
+    if properties:
+        props = relation_properties(rel, properties)
+        result['property_names'] = np.array(list(props))
+        result['properties'] = np.array(list(props.values()), dtype=bool)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    out_path = os.path.join(out_dir, stem + '.npz')
+    np.savez_compressed(out_path, **result)
+    return path, out_path, props
+
+
+def load_result(path):
+    """Чтение результата: {'n', замыкания как BitRelation, 'properties' как словарь}"""
+    with np.load(path) as data:
+        n = int(data['n'])
+        result = {'n': n}
+        for name in CLOSURES:
+            if name in data:
+                result[name] = BitRelation(n, data[name].astype(np.dtype('<u8')))
+        if 'properties' in data:
+            names = data['property_names'].tolist() if 'property_names' in data else list(PROPERTIES)
+            result['properties'] = dict(zip(names, data['properties'].tolist()))
+    return result
+
+
+def run_batch(paths, closures=('transitive',), properties=tuple(PROPERTIES), out_dir='.', workers=None, n=None):
+    """Раздаёт отношения пулу процессов; возвращает список (вход, выход, свойства).
+    properties - ключи PROPERTIES, которые проверять"""
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_relation, path, closures, properties, out_dir, n)
+                   for path in paths]
+        return [future.result() for future in futures]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетное вычисление замыканий и свойств отношений")
+    parser.add_argument('paths', nargs='+', help="файлы .npy или списки пар")
+    parser.add_argument('-c', '--closures', nargs='*', default=['transitive'],
+                        choices=sorted(CLOSURES), help="какие замыкания строить")
+    parser.add_argument('-p', '--properties', nargs='*', default=None, choices=list(PROPERTY_NAMES),
+                        help="какие свойства проверять (без имён - все)")
+    parser.add_argument('-o', '--out', default='.', help="каталог для результатов")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="число процессов")
+    parser.add_argument('-n', type=int, default=None, help="мощность X для списков пар")
+    args = parser.parse_args(argv)
+    if args.properties is None:
+        properties = ()
+    else:
+        properties = [PROPERTY_NAMES[name] for name in args.properties or PROPERTY_NAMES]
+    for path, out_path, props in run_batch(args.paths, args.closures, properties,
+                                           args.out, args.workers, args.n):
+        line = f"{path} -> {out_path}"
+        if props:
+            line += " " + ", ".join(f"{name}: {value}" for name, value in props.items())
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
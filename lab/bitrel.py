@@ -0,0 +1,175 @@
+import itertools
+import numpy as np
+
+WORD = np.dtype('<u8')  # слово битовой строки: 64 пары, младший бит - младший столбец
+ONE = np.uint64(1)
+CHUNK = 1 << 20  # сколько пар читаем из итератора за один раз
+BLOCK_ELEMS = 1 << 24  # предел элементов матрицы в одном блоке (полосы строк, плотные операнды)
+
+
+def popcount(words, axis=None):
+    """Число единичных битов в массиве слов; axis - суммировать по оси (массив int64)"""
+    if hasattr(np, 'bitwise_count'):
+        counts = np.bitwise_count(words)
+    else:
+        bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=-1)
+        counts = bits.reshape(words.shape + (64,)).sum(axis=-1)
+    if axis is None:
+        return int(counts.sum())
+    return counts.sum(axis=axis, dtype=np.int64)
+
+
+def pack_rows(matrix, n_words):
+    """Упаковка строк булевой матрицы в слова uint64"""
+    matrix = np.asarray(matrix, dtype=bool)
+    packed = np.packbits(matrix, axis=-1, bitorder='little')
+    buf = np.zeros(matrix.shape[:-1] + (n_words * 8,), dtype=np.uint8)
+    buf[..., :packed.shape[-1]] = packed
+    return buf.view(WORD)
+
+
+class BitRelation:
+    """Отношение на множестве {1..n} в виде битовой матрицы: строка - n_words слов uint64"""
+
+    def __init__(self, n, words=None):
+        self.n = n
+        self.n_words = (n + 63) // 64
+        if words is None:
+            words = np.zeros((n, self.n_words), dtype=WORD)
+        self.words = words
+
+    @classmethod
+    def from_pairs(cls, pairs, n):
+        """Построение по итерируемому набору пар (x, y), 1 ≤ x, y ≤ n"""
+        rel = cls(n)
+        flat = itertools.chain.from_iterable(pairs)
+        while True:
+            chunk = np.fromiter(itertools.islice(flat, 2 * CHUNK), dtype=np.int64)
+            if chunk.size == 0:
+                break
+            chunk = chunk.reshape(-1, 2)
+            ok = (chunk >= 1).all(axis=1) & (chunk <= n).all(axis=1)  # как в relation_matrix
+            rows = chunk[ok, 0] - 1
+            cols = chunk[ok, 1] - 1
+            rel.set_bits(rows, cols)
+        return rel
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Упаковка плотной матрицы 0/1"""
+        n = len(matrix)
+        return cls(n, pack_rows(matrix, (n + 63) // 64))
+
+    def to_matrix(self, dtype=int):
+        """Распаковка в плотную матрицу n x n"""
+        bits = np.unpackbits(self.words.view(np.uint8), axis=1, bitorder='little')
+        return bits[:, :self.n].astype(dtype)
+
+    def copy(self):
+        return BitRelation(self.n, self.words.copy())
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, index):
+        i, j = index
+        return bool((self.words[i, j >> 6] >> np.uint64(j & 63)) & ONE)
+
+    def __setitem__(self, index, value):
+        i, j = index
+        if value:
+            self.words[i, j >> 6] |= ONE << np.uint64(j & 63)
+        else:
+            self.words[i, j >> 6] &= ~(ONE << np.uint64(j & 63))
+
+    def set_bits(self, rows, cols):
+        """Установка пар (rows[t], cols[t]) по 0-индексам"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        np.bitwise_or.at(self.words, (rows, cols >> 6), ONE << (cols & 63).astype(WORD))
+
+    def clear_bits(self, rows, cols):
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        np.bitwise_and.at(self.words, (rows, cols >> 6), ~(ONE << (cols & 63).astype(WORD)))
+
+    def column(self, k):
+        """Булев вектор столбца k: у каких строк есть пара (i, k)"""
+        return ((self.words[:, k >> 6] >> np.uint64(k & 63)) & ONE).astype(bool)
+
+    def diagonal(self):
+        idx = np.arange(self.n)
+        return ((self.words[idx, idx >> 6] >> (idx & 63).astype(WORD)) & ONE).astype(bool)
+
+    def set_diagonal(self):
+        idx = np.arange(self.n)
+        self.set_bits(idx, idx)
+
+    def clear_diagonal(self):
+        idx = np.arange(self.n)
+        self.clear_bits(idx, idx)
+
+    def transpose(self):
+        """Транспонирование блоками по 64 строки - один столбец слов результата"""
+        result = BitRelation(self.n)
+        for w in range(self.n_words):
+            block = np.unpackbits(self.words[w * 64:(w + 1) * 64].view(np.uint8),
+                                  axis=1, bitorder='little')[:, :self.n]
+            column = np.zeros((self.n, 8), dtype=np.uint8)
+            packed = np.packbits(block.T, axis=1, bitorder='little')
+            column[:, :packed.shape[1]] = packed
+            result.words[:, w] = column.view(WORD)[:, 0]
+        return result
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def _tail_mask(self):
+        mask = np.full(self.n_words, np.iinfo(np.uint64).max, dtype=WORD)
+        if self.n % 64:
+            mask[-1] = (ONE << np.uint64(self.n % 64)) - ONE
+        return mask
+
+    def __or__(self, other):
+        return BitRelation(self.n, self.words | other.words)
+
+    def __and__(self, other):
+        return BitRelation(self.n, self.words & other.words)
+
+    def __xor__(self, other):
+        return BitRelation(self.n, self.words ^ other.words)
+
+    def __invert__(self):
+        return BitRelation(self.n, ~self.words & self._tail_mask())
+
+    def __eq__(self, other):
+        if not isinstance(other, BitRelation):
+            return NotImplemented
+        return self.n == other.n and np.array_equal(self.words, other.words)
+
+    def any(self):
+        return bool(self.words.any())
+
+    def count(self):
+        """Число пар в отношении"""
+        return popcount(self.words)
+
+    def row(self, i):
+        """Номера столбцов (0-индексы) единиц в строке i"""
+        bits = np.unpackbits(self.words[i].view(np.uint8), bitorder='little')[:self.n]
+        return np.flatnonzero(bits)
+
+    def pairs(self):
+        """Генератор пар (x, y) в нумерации 1..n"""
+        for i in range(self.n):
+            if self.words[i].any():
+                for j in self.row(i):
+                    yield (i + 1, int(j) + 1)
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
+
+    def __repr__(self):
+        return f"BitRelation(n={self.n}, pairs={self.count()})"
@@ -0,0 +1,190 @@
+import numpy as np
+from bitrel import BitRelation, pack_rows
+
+SPARSE_DENSITY = 0.05  # ниже этой плотности - замыкание через конденсацию
+BITS_MIN_N = 128  # с этого n строки выгоднее держать упакованными
+
+
+def reflexive_closure(matrix):
+    if isinstance(matrix, BitRelation):
+        closure = matrix.copy()
+        closure.set_diagonal()
+        return closure
+    closure = np.array(matrix, copy=True)
+    np.fill_diagonal(closure, 1)
+    return closure
+
+
+def symmetric_closure(matrix):
+    if isinstance(matrix, BitRelation):
+        return matrix | matrix.T
+    return np.logical_or(matrix, np.transpose(matrix)).astype(int)
+
+
+def warshall_rows(matrix):
+    """Уоршелл по строкам: для каждого k строка k добавляется ко всем строкам с парой (i, k)"""
+    closure = np.array(matrix, dtype=bool)
+    for k in range(len(closure)):
+        rows = closure[:, k]
+        closure[rows] |= closure[k]
+    return closure
+
+
+def warshall_bits(rel):
+    """Тот же Уоршелл, но над BitRelation - по 64 пары за операцию"""
+    closure = rel.copy()
+    for k in range(closure.n):
+        rows = closure.column(k)
+        closure.words[rows] |= closure.words[k]
+    return closure
+
+
+def _csr(n, src, dst):
+    order = np.argsort(src, kind='stable')
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+    return offsets.tolist(), dst[order].tolist()
+
+
+def strongly_connected_components(n, offsets, targets):
+    """Итеративный Тарьян; компоненты нумеруются в обратном топологическом порядке"""
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    comp = [-1] * n
+    stack = []
+    counter = 0
+    count = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [[root, offsets[root]]]
+        while work:
+            frame = work[-1]
+            v, pos = frame
+            if pos < offsets[v + 1]:
+                frame[1] += 1
+                w = targets[pos]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append([w, offsets[w]])
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = count
+                        if w == v:
+                            break
+                    count += 1
+    return comp, count
+
+
+def _edges(matrix):
+    if isinstance(matrix, BitRelation):
+        rows = [matrix.row(i) for i in range(matrix.n)]
+        src = np.repeat(np.arange(matrix.n), [len(row) for row in rows])
+        dst = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        return src, dst
+    return np.nonzero(matrix)
+
+
+def _component_reach(n, src, dst):
+    """Замыкание на графе конденсации: для каждой компоненты - битовая маска достижимых"""
+    offsets, targets = _csr(n, src, dst)
+    comp, count = strongly_connected_components(n, offsets, targets)
+    comp = np.array(comp, dtype=np.int64)
+    csrc, cdst = comp[src], comp[dst]
+    cyclic = np.bincount(comp, minlength=count) > 1
+    cyclic[csrc[csrc == cdst]] = True  # петля тоже даёт пару (x, x)
+    between = csrc != cdst
+    succ = [[] for _ in range(count)]
+    for a, b in set(zip(csrc[between].tolist(), cdst[between].tolist())):
+        succ[a].append(b)
+    reach = [0] * count
+    for c in range(count):  # наследники имеют меньшие номера и уже посчитаны
+        bits = 1 << c if cyclic[c] else 0
+        for d in succ[c]:
+            bits |= reach[d] | (1 << d)
+        reach[c] = bits
+    return comp, count, reach
+
+
+def _mask(bits, count):
+    raw = np.frombuffer(bits.to_bytes((count + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder='little')[:count].astype(bool)
+
+
+def scc_closure(matrix):
+    """Замыкание по Пурдому: компоненты сильной связности, затем DAG конденсации"""
+    n = len(matrix)
+    src, dst = _edges(matrix)
+    comp, count, reach = _component_reach(n, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64))
+    members = [[] for _ in range(count)]
+    for v, c in enumerate(comp.tolist()):
+        members[c].append(v)
+    if isinstance(matrix, BitRelation):
+        closure = BitRelation(n)
+    else:
+        closure = np.zeros((n, n), dtype=bool)
+    for c in range(count):
+        if not reach[c]:
+            continue
+        row = _mask(reach[c], count)[comp]
+        if isinstance(closure, BitRelation):
+            closure.words[members[c]] = pack_rows(row, closure.n_words)
+        else:
+            closure[members[c]] = row
+    return closure
+
+
+def choose_method(matrix):
+    """Выбор стратегии по плотности отношения"""
+    n = len(matrix)
+    if n == 0:
+        return 'rows'
+    pairs = matrix.count() if isinstance(matrix, BitRelation) else np.count_nonzero(matrix)
+    if pairs / (n * n) < SPARSE_DENSITY:
+        return 'scc'
+    if isinstance(matrix, BitRelation) or n >= BITS_MIN_N:
+        return 'bits'
+    return 'rows'
+
+
+def transitive_closure(matrix, method=None):
+    """Транзитивное замыкание; method - 'rows', 'bits', 'scc' или None (по плотности).
+    Возвращает результат того же вида, что и вход: матрицу того же dtype или BitRelation"""
+    if method is None:
+        method = choose_method(matrix)
+    if isinstance(matrix, BitRelation):
+        if method == 'scc':
+            return scc_closure(matrix)
+        if method == 'rows':
+            return BitRelation.from_matrix(warshall_rows(matrix.to_matrix(bool)))
+        return warshall_bits(matrix)
+    if method == 'scc':
+        closure = scc_closure(matrix)
+    elif method == 'bits':
+        closure = warshall_bits(BitRelation.from_matrix(matrix)).to_matrix(bool)
+    else:
+        closure = warshall_rows(matrix)
+    return closure.astype(np.asarray(matrix).dtype)
+
+
+CLOSURES = {
+    'reflexive': reflexive_closure,
+    'symmetric': symmetric_closure,
+    'transitive': transitive_closure
+}
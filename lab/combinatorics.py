@@ -0,0 +1,143 @@
+"""Перестановки и сочетания потоком: лексикографический ранг и восстановление по рангу,
+выдача диапазона рангов [start, stop) блоками фиксированного размера и раздача
+диапазонов процессам - каждый процесс восстанавливает свою первую перестановку по рангу
+и ни с кем не согласуется.
+
+Порядок тот же, что у itertools.permutations / itertools.combinations: по позициям в elements.
+"""
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_SIZE = 1 << 16  # перестановок/сочетаний в одном блоке
+
+
+def permutation_rank(perm: list) -> int:
+    """Номер перестановки индексов 0..n-1 в лексикографическом порядке"""
+    rest = sorted(perm)
+    rank = 0
+    for i, x in enumerate(perm):
+        pos = rest.index(x)
+        rank += pos * math.factorial(len(perm) - 1 - i)
+        rest.pop(pos)
+    return rank
+
+
+def permutation_unrank(n: int, rank: int) -> list:
+    """Перестановка индексов 0..n-1 с номером rank (факториальная система счисления)"""
+    rest = list(range(n))
+    perm = []
+    for i in range(n - 1, -1, -1):
+        pos, rank = divmod(rank, math.factorial(i))
+        perm.append(rest.pop(pos))
+    return perm
+
+
+def combination_rank(comb: list, n: int) -> int:
+    """Номер возрастающего набора индексов comb среди k-сочетаний из n"""
+    k = len(comb)
+    rank = 0
+    prev = -1
+    for i, c in enumerate(comb):
+        for skipped in range(prev + 1, c):  # сочетания с меньшим элементом на месте i
+            rank += math.comb(n - 1 - skipped, k - 1 - i)
+        prev = c
+    return rank
+
+
+def combination_unrank(n: int, k: int, rank: int) -> list:
+    """k-сочетание индексов 0..n-1 с номером rank"""
+    comb = []
+    x = 0
+    for i in range(k):
+        while True:
+            block = math.comb(n - 1 - x, k - 1 - i)  # сочетания, где на месте i стоит x
+            if rank < block:
+                break
+            rank -= block
+            x += 1
+        comb.append(x)
+        x += 1
+    return comb
+
+
+def permutations_range(elements: list, start: int = 0, stop: int = None):
+    """Перестановки с номерами start..stop-1. Диапазон режется на блоки с общим префиксом,
+    хвост каждого блока перебирает itertools.permutations"""
+    n = len(elements)
+    total = math.factorial(n)
+    stop = total if stop is None else min(stop, total)
+    rank = start
+    while rank < stop:
+        perm = permutation_unrank(n, rank)
+        m = 1
+        while m < n and rank % math.factorial(m + 1) == 0 and rank + math.factorial(m + 1) <= stop:
+            m += 1  # последние m позиций - первая перестановка своего хвоста: весь блок m! подряд
+        prefix = tuple(elements[i] for i in perm[:n - m])
+        tail = [elements[i] for i in sorted(perm[n - m:])]
+        if prefix:
+            for suffix in itertools.permutations(tail):
+                yield prefix + suffix
+        else:
+            yield from itertools.permutations(tail)
+        rank += math.factorial(m)
+
+
+def combinations_range(elements: list, k: int, start: int = 0, stop: int = None):
+    """Сочетания из elements по k с номерами start..stop-1, блоками с общим префиксом"""
+    n = len(elements)
+    total = math.comb(n, k)
+    stop = total if stop is None else min(stop, total)
+    rank = start
+    while rank < stop:
+        comb = combination_unrank(n, k, rank)
+        j = k
+        while j > 0:  # расширяем свободный хвост, пока он - первое сочетание своего блока
+            first = comb[j - 2] + 1 if j > 1 else 0
+            if comb[j - 1:] != list(range(first, first + k - j + 1)):
+                break
+            if rank + math.comb(n - first, k - j + 1) > stop:
+                break
+            j -= 1
+        prefix = tuple(elements[i] for i in comb[:j])
+        first = comb[j - 1] + 1 if j > 0 else 0
+        block = 0
+        for suffix in itertools.combinations(elements[first:], k - j):
+            yield prefix + suffix
+            block += 1
+        rank += block
+
+
+def chunked(iterable, chunk_size: int = CHUNK_SIZE):
+    """Списки по chunk_size подряд идущих элементов"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def permutation_chunks(elements: list, chunk_size: int = CHUNK_SIZE, start: int = 0, stop: int = None):
+    return chunked(permutations_range(elements, start, stop), chunk_size)
+
+
+def combination_chunks(elements: list, k: int, chunk_size: int = CHUNK_SIZE, start: int = 0, stop: int = None):
+    return chunked(combinations_range(elements, k, start, stop), chunk_size)
+
+
+def shards(total: int, parts: int) -> list:
+    """Разбиение [0, total) на parts диапазонов почти равной длины"""
+    bounds = [total * i // parts for i in range(parts + 1)]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def map_shards(func, total: int, workers: int = None, parts: int = None) -> list:
+    """func(start, stop) по диапазонам рангов в пуле процессов; результаты в порядке диапазонов.
+    func должна быть функцией уровня модуля (её передают в процессы)"""
+    if parts is None:
+        parts = 4 * (workers or os.cpu_count() or 1)
+    ranges = shards(total, parts)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, [a for a, b in ranges], [b for a, b in ranges]))
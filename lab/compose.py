@@ -0,0 +1,90 @@
+from collections import defaultdict
+import numpy as np
+from bitrel import BitRelation
+from relation import Relation
+
+DENSE_DENSITY = 0.05  # при большей плотности R композиция через произведение матриц
+
+
+def index_pairs(rel):
+    """Индекс отношения по первому элементу: x -> список y"""
+    index = defaultdict(list)
+    for x, y in rel:
+        index[x].append(y)
+    return index
+
+
+def iter_compose(R, Q):
+    """Потоковая композиция RoQ: каждая пара (x, y) выдаётся ровно один раз.
+    Q индексируется по первому элементу, R группируется по x - в памяти только
+    индекс Q и множество y для текущего x"""
+    q_index = index_pairs(Q)
+    for x, zs in index_pairs(R).items():
+        ys = set()
+        for z in zs:
+            ys.update(q_index.get(z, ()))
+        for y in ys:
+            yield (x, y)
+
+
+def compose_bits(R, Q):
+    """Композиция BitRelation: строка i результата - OR строк Q по единицам строки i из R"""
+    result = BitRelation(R.n)
+    for i in range(R.n):
+        cols = R.row(i)
+        if len(cols):
+            result.words[i] = np.bitwise_or.reduce(Q.words[cols], axis=0)
+    return result
+
+
+def compose_matrix(MR, MQ):
+    """Композиция по матрицам: булево произведение через BLAS"""
+    MR = np.asarray(MR)
+    product = MR.astype(np.float32) @ np.asarray(MQ).astype(np.float32) > 0
+    return product.astype(MR.dtype)
+
+
+def _pairs_matrix(rel, n):
+    matrix = np.zeros((n, n), dtype=bool)
+    pairs = np.array(list(rel), dtype=np.int64).reshape(-1, 2)
+    ok = (pairs >= 1).all(axis=1) & (pairs <= n).all(axis=1)
+    matrix[pairs[ok, 0] - 1, pairs[ok, 1] - 1] = True
+    return matrix
+
+
+def _as_matrix(rel, n):
+    if isinstance(rel, Relation):  # универсум считается равным {1..n}
+        return rel.to_matrix(bool)
+    if isinstance(rel, BitRelation) and rel.n == n:
+        return rel.to_matrix(bool)
+    return _pairs_matrix(_as_pairs(rel), n)
+
+
+def _as_pairs(rel):
+    """Пары отношения: у BitRelation len - это n, а не число пар, и итерации по парам нет"""
+    return rel.pairs() if isinstance(rel, BitRelation) else rel
+
+
+def _pair_count(rel):
+    return rel.count() if isinstance(rel, BitRelation) else len(rel)
+
+
+def compose(R, Q, n=None, method=None):
+    """Композиция RoQ. R и Q - списки пар, Relation или BitRelation; две BitRelation дают
+    BitRelation, иначе - список пар (n по умолчанию берётся у BitRelation, если она есть).
+    method: 'hash' (индекс Q по первому элементу), 'matrix' (произведение матриц на {1..n})
+    или None - выбор по плотности R, если известно n"""
+    if isinstance(R, BitRelation) and isinstance(Q, BitRelation):
+        return compose_bits(R, Q)
+    if n is None and isinstance(R, BitRelation):
+        n = R.n
+    elif n is None and isinstance(Q, BitRelation):
+        n = Q.n
+    if method is None:
+        method = 'matrix' if n and _pair_count(R) > DENSE_DENSITY * n * n else 'hash'
+    if method == 'matrix':
+        if n is None:
+            raise ValueError("для method='matrix' нужно n")
+        rows, cols = np.nonzero(compose_matrix(_as_matrix(R, n), _as_matrix(Q, n)))
+        return list(zip((rows + 1).tolist(), (cols + 1).tolist()))
+    return list(iter_compose(_as_pairs(R), _as_pairs(Q)))
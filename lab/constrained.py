@@ -0,0 +1,71 @@
+"""Сочетания с ограничениями без перебора всех C(n, k): ветви отсекаются во время построения.
+
+Ограничения: границы суммы весов, обязательные и запрещённые элементы, пары "не вместе".
+Для границ суммы заранее считаются наименьшая и наибольшая сумма r элементов хвоста
+(с учётом обязательных), поэтому ветвь, из которой нельзя уложиться в границы, не открывается.
+Порядок выдачи тот же, что у itertools.combinations.
+"""
+import math
+
+
+def _tail_bounds(weights, forced, k, best):
+    """best-сумма (min или max) r элементов хвоста с позиции i, обязательные берутся всегда;
+    inf / -inf - набрать r элементов нельзя"""
+    n = len(weights)
+    worst = math.inf if best is min else -math.inf
+    table = [[worst] * (k + 1) for _ in range(n + 1)]
+    table[n][0] = 0
+    for i in range(n - 1, -1, -1):
+        for r in range(k + 1):
+            take = weights[i] + table[i + 1][r - 1] if r > 0 else worst
+            table[i][r] = take if forced[i] else best(take, table[i + 1][r])
+    return table
+
+
+def constrained_combinations(elements: list, k: int, min_sum: float = None, max_sum: float = None,
+                             include=(), exclude=(), apart=(), weight=None):
+    """k-сочетания elements с суммой весов в [min_sum, max_sum], со всеми элементами include,
+    без элементов exclude и без обеих вершин любой пары из apart.
+    weight(x) - вес элемента (по умолчанию сам элемент, если заданы границы суммы)"""
+    include, exclude = set(include), set(exclude)
+    pool = [x for x in elements if x not in exclude]
+    n = len(pool)
+    if k < 0 or k > n or not include <= set(pool):  # обязательный элемент исключён или отсутствует
+        return
+    if weight is None:
+        weight = (lambda x: x) if min_sum is not None or max_sum is not None else (lambda x: 0)
+    weights = [weight(x) for x in pool]
+    forced = [x in include for x in pool]
+    lo = -math.inf if min_sum is None else min_sum
+    hi = math.inf if max_sum is None else max_sum
+    low = _tail_bounds(weights, forced, k, min)
+    high = _tail_bounds(weights, forced, k, max)
+    partners = {}
+    for a, b in apart:
+        partners.setdefault(a, []).append(b)
+        partners.setdefault(b, []).append(a)
+    partner_positions = [[j for j, y in enumerate(pool) if y in partners.get(x, ())] for x in pool]
+    next_forced = [n] * (n + 1)  # ближайшая обязательная позиция не левее i
+    for i in range(n - 1, -1, -1):
+        next_forced[i] = i if forced[i] else next_forced[i + 1]
+    banned = [0] * n
+    chosen = []
+
+    def walk(i, r, total):
+        if low[i][r] == math.inf or total + low[i][r] > hi or total + high[i][r] < lo:
+            return
+        if r == 0:
+            yield tuple(chosen)
+            return
+        for j in range(i, min(next_forced[i], n - r) + 1):  # обязательный элемент пропускать нельзя
+            if banned[j]:
+                continue
+            chosen.append(pool[j])
+            for p in partner_positions[j]:
+                banned[p] += 1
+            yield from walk(j + 1, r - 1, total + weights[j])
+            for p in partner_positions[j]:
+                banned[p] -= 1
+            chosen.pop()
+
+    yield from walk(0, k, 0)
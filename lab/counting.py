@@ -0,0 +1,69 @@
+"""Точное число перестановок и сочетаний без их перебора.
+
+Простые случаи - по формулам, сочетания с границами суммы - динамикой по суммам
+(число j-элементных подмножеств с каждой суммой), пары "не вместе" - включением-исключением
+по множествам нарушенных пар.
+"""
+import itertools
+import math
+from collections import Counter
+
+
+def count_permutations(n: int, r: int = None) -> int:
+    """Размещения из n по r (по умолчанию перестановки n элементов)"""
+    return math.perm(n, r)
+
+
+def count_combinations(n: int, k: int) -> int:
+    return math.comb(n, k)
+
+
+def count_by_sum(weights: list, k: int, max_sum: float = None) -> Counter:
+    """Сумма -> число k-элементных подмножеств weights с такой суммой.
+    При неотрицательных весах суммы больше max_sum не хранятся"""
+    prune = max_sum is not None and all(w >= 0 for w in weights)
+    layers = [Counter() for _ in range(k + 1)]
+    layers[0][0] = 1
+    for w in weights:
+        for j in range(min(k, len(weights)), 0, -1):  # с конца - каждый элемент берётся один раз
+            for s, c in layers[j - 1].items():
+                if not prune or s + w <= max_sum:
+                    layers[j][s + w] += c
+    return layers[k] if k >= 0 else Counter()
+
+
+def count_sum_bounded(weights: list, k: int, min_sum: float = None, max_sum: float = None) -> int:
+    """Число k-сочетаний с суммой в [min_sum, max_sum]"""
+    if k < 0 or k > len(weights):
+        return 0
+    if min_sum is None and max_sum is None:
+        return math.comb(len(weights), k)
+    lo = -math.inf if min_sum is None else min_sum
+    hi = math.inf if max_sum is None else max_sum
+    return sum(c for s, c in count_by_sum(weights, k, max_sum).items() if lo <= s <= hi)
+
+
+def count_constrained(elements: list, k: int, min_sum: float = None, max_sum: float = None,
+                      include=(), exclude=(), apart=(), weight=None) -> int:
+    """Число сочетаний, которые выдал бы constrained_combinations с теми же аргументами.
+    Включение-исключение по наборам пар apart: для набора S все вершины S обязательны,
+    знак (-1)^|S|; каждое слагаемое - динамика по суммам"""
+    include, exclude = set(include), set(exclude)
+    pool = [x for x in elements if x not in exclude]
+    if k < 0 or k > len(pool) or not include <= set(pool):
+        return 0
+    if weight is None:
+        weight = (lambda x: x) if min_sum is not None or max_sum is not None else (lambda x: 0)
+    pairs = [(a, b) for a, b in apart if a in pool and b in pool and a != b]
+    total = 0
+    for size in range(len(pairs) + 1):
+        for subset in itertools.combinations(pairs, size):
+            forced = include | {x for pair in subset for x in pair}
+            rest = [weight(x) for x in pool if x not in forced]
+            if len(pool) - len(rest) > k:
+                continue
+            base = sum(weight(x) for x in pool if x in forced)
+            lo = None if min_sum is None else min_sum - base
+            hi = None if max_sum is None else max_sum - base
+            total += (-1) ** size * count_sum_bounded(rest, k - (len(pool) - len(rest)), lo, hi)
+    return total
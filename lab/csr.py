@@ -0,0 +1,104 @@
+import numpy as np
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # scipy не обязателен - нужен только для разреженной матрицы
+    sparse = None
+
+
+class CSR:
+    """Неориентированный граф в формате CSR: соседи вершины i -
+    neighbors[offsets[i]:offsets[i + 1]], вершины занумерованы 0..n-1"""
+
+    def __init__(self, offsets, neighbors):
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.n = len(offsets) - 1
+
+    @classmethod
+    def from_edges(cls, n, src, dst):
+        """Построение по массивам концов рёбер; каждое ребро попадает в оба списка"""
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        heads = np.concatenate([src, dst])
+        tails = np.concatenate([dst, src])
+        order = np.argsort(heads, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(heads, minlength=n), out=offsets[1:])
+        return cls(offsets, tails[order])
+
+    def degrees(self):
+        return np.diff(self.offsets)
+
+    def neighbors_of(self, i):
+        return self.neighbors[self.offsets[i]:self.offsets[i + 1]]
+
+    def gather(self, frontier):
+        """Все соседи вершин frontier одним массивом"""
+        starts = self.offsets[frontier]
+        lengths = self.offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(0, dtype=self.neighbors.dtype)
+        shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.neighbors[shift + np.arange(total)]
+
+    def _dedupe(self, items, scratch):
+        """Удаление повторов за O(len(items)): остаётся последнее вхождение"""
+        positions = np.arange(len(items))
+        scratch[items] = positions
+        return items[scratch[items] == positions]
+
+    def bfs(self, start):
+        """Расстояния от start (-1 - недостижима), поуровневый BFS над массивами"""
+        dist = np.full(self.n, -1, dtype=np.int64)
+        scratch = np.empty(self.n, dtype=np.int64)
+        dist[start] = 0
+        frontier = np.array([start], dtype=np.int64)
+        level = 0
+        while len(frontier):
+            level += 1
+            nxt = self.gather(frontier)
+            frontier = self._dedupe(nxt[dist[nxt] < 0], scratch)
+            dist[frontier] = level
+        return dist
+
+    def components(self):
+        """Метки компонент связности и их число"""
+        if sparse is not None:
+            from scipy.sparse.csgraph import connected_components
+            count, labels = connected_components(self.to_sparse(), directed=False)
+            return labels, count
+        labels = np.full(self.n, -1, dtype=np.int64)
+        scratch = np.empty(self.n, dtype=np.int64)
+        count = 0
+        for start in range(self.n):
+            if labels[start] >= 0:
+                continue
+            labels[start] = count
+            frontier = np.array([start], dtype=np.int64)
+            while len(frontier):
+                nxt = self.gather(frontier)
+                frontier = self._dedupe(nxt[labels[nxt] < 0], scratch)
+                labels[frontier] = count
+            count += 1
+        return labels, count
+
+    def to_dense(self, dtype=int):
+        matrix = np.zeros((self.n, self.n), dtype=dtype)
+        rows = np.repeat(np.arange(self.n), self.degrees())
+        matrix[rows, self.neighbors] = 1
+        return matrix
+
+    def to_sparse(self):
+        if sparse is None:
+            raise ImportError("для разреженной матрицы нужен scipy")
+        data = np.ones(len(self.neighbors), dtype=np.int8)
+        matrix = sparse.csr_matrix((data, self.neighbors, self.offsets), shape=(self.n, self.n))
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return matrix
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.neighbors.nbytes
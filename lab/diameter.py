@@ -0,0 +1,134 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from csr import CSR
+
+BITPARALLEL_MAX_N = 4096  # до такого n эксцентриситеты всех вершин - битовым BFS
+BITPARALLEL_DENSITY = 0.05  # и только если граф достаточно плотный
+BATCH_SOURCES = 64  # сколько BFS iFUB ведёт одновременно (одно слово на вершину)
+
+
+def _middle(csr, a, b, dist_a):
+    """Вершина в середине кратчайшего пути a-b"""
+    dist_b = csr.bfs(b)
+    d = dist_a[b]
+    on_path = np.flatnonzero((dist_a + dist_b == d) & (dist_a == d // 2))
+    return int(on_path[0])
+
+
+def ifub_diameter(csr, start=None):
+    """Точный диаметр алгоритмом iFUB: BFS от центральной вершины u, затем эксцентриситеты
+    вершин по уровням от дальнего к ближнему, пока нижняя оценка не сойдётся с верхней.
+    Для несвязного графа - inf"""
+    if csr.n == 0:
+        return 0
+    if start is None:  # 2-sweep от вершины наибольшей степени, u - середина найденного пути
+        r = int(np.argmax(csr.degrees()))
+        dist_r = csr.bfs(r)
+        if (dist_r < 0).any():
+            return float('inf')
+        a = int(np.argmax(dist_r))
+        dist_a = csr.bfs(a)
+        start = _middle(csr, a, int(np.argmax(dist_a)), dist_a)
+    dist_u = csr.bfs(start)
+    if (dist_u < 0).any():
+        return float('inf')
+    i = int(dist_u.max())
+    lower, upper = i, 2 * i
+    while upper > lower:
+        fringe = np.flatnonzero(dist_u == i)
+        for b0 in range(0, len(fringe), BATCH_SOURCES):  # пачка BFS сразу, выход после пачки
+            lower = max(lower, int(_fringe_eccentricities(csr, fringe[b0:b0 + BATCH_SOURCES]).max()))
+            if lower > 2 * (i - 1):
+                return lower
+        upper = 2 * (i - 1)
+        i -= 1
+    return lower
+
+
+def _fringe_eccentricities(csr, sources):
+    if isinstance(csr, CSR):
+        return bitparallel_eccentricities(csr, sources)
+    return np.array([csr.bfs(s).max() for s in sources], dtype=np.int64)  # граф связен
+
+
+def bitparallel_eccentricities(csr, sources=None, batch=BATCH_SOURCES):
+    """Эксцентриситеты вершин sources (по умолчанию всех) одновременным BFS:
+    бит t строки v - "v на фронте BFS из sources[t]"; шаг - OR строк соседей.
+    Источники берутся пачками по batch; недостижимость даёт -1"""
+    n = csr.n
+    if sources is None:
+        sources = np.arange(n)
+    sources = np.asarray(sources, dtype=np.int64)
+    ecc = np.zeros(len(sources), dtype=np.int64)
+    isolated = csr.degrees() == 0
+    padded = np.append(csr.neighbors, n)  # строка-заглушка n: reduceat не выходит за край
+    one = np.uint64(1)
+    for b0 in range(0, len(sources), batch):
+        part = sources[b0:b0 + batch]
+        k = len(part)
+        t = np.arange(k)
+        frontier = np.zeros((n + 1, (k + 63) // 64), dtype=np.uint64)
+        np.bitwise_or.at(frontier, (part, t >> 6), one << (t & 63).astype(np.uint64))
+        seen = frontier[:n].copy()
+        level = 0
+        while frontier.any():
+            level += 1
+            nxt = np.bitwise_or.reduceat(frontier[padded], csr.offsets[:-1], axis=0)
+            nxt[isolated] = 0
+            nxt &= ~seen
+            seen |= nxt
+            active = np.unpackbits(np.bitwise_or.reduce(nxt, axis=0).view(np.uint8),
+                                   bitorder='little')[:k].astype(bool)
+            ecc[b0 + t[active]] = level
+            frontier[:n] = nxt
+        complete = np.unpackbits(np.bitwise_and.reduce(seen, axis=0).view(np.uint8),
+                                 bitorder='little')[:k].astype(bool)
+        ecc[b0 + t[~complete]] = -1
+    return ecc
+
+
+_worker_csr = None
+
+
+def _init_worker(offsets, neighbors):
+    global _worker_csr
+    _worker_csr = CSR(offsets, neighbors)
+
+
+def _chunk_eccentricities(sources):
+    result = []
+    for s in sources:
+        dist = _worker_csr.bfs(s)
+        result.append(-1 if (dist < 0).any() else int(dist.max()))
+    return result
+
+
+def eccentricities(csr, workers=None, chunk=64):
+    """Эксцентриситеты всех вершин: BFS из каждой, источники раздаются пулу процессов.
+    Для вершин несвязного графа - -1"""
+    chunks = [list(range(s, min(csr.n, s + chunk))) for s in range(0, csr.n, chunk)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(csr.offsets, csr.neighbors)) as pool:
+        parts = pool.map(_chunk_eccentricities, chunks)
+        return np.array([e for part in parts for e in part], dtype=np.int64)
+
+
+def choose_method(csr):
+    """Выбор алгоритма для эксцентриситетов всех вершин по размеру и плотности графа:
+    'bitparallel' - битовый BFS пачками по BATCH_SOURCES источников (не больше
+    BITPARALLEL_MAX_N вершин, плотность от BITPARALLEL_DENSITY), иначе - BFS из каждой вершины"""
+    if not isinstance(csr, CSR):  # неявный граф (implicit) - без массива соседей, только iFUB
+        return 'ifub'
+    dense = csr.n and len(csr.neighbors) >= BITPARALLEL_DENSITY * csr.n * csr.n
+    return 'bitparallel' if csr.n <= BITPARALLEL_MAX_N and dense else 'ifub'
+
+
+def diameter(csr, method='ifub'):
+    """Диаметр; method - 'ifub' (по умолчанию, для любых графов: BFS с края идут
+    битовыми пачками) или 'bitparallel' (эксцентриситеты всех вершин сразу)"""
+    if method == 'bitparallel':
+        ecc = bitparallel_eccentricities(csr)
+        if (ecc < 0).any():
+            return float('inf')
+        return int(ecc.max()) if csr.n else 0
+    return ifub_diameter(csr)
@@ -0,0 +1,152 @@
+"""Загрузка больших графов из файлов рёбер прямо в CSR, без кортежей Python.
+
+Текстовый список рёбер ("u v" в строке, дальше могут идти веса, '#' - комментарий) читается блоками,
+бинарный файл пар int32/int64 отображается в память (np.memmap) и тоже идёт срезами.
+С count_first=True первый проход считает степени, и массив соседей сразу
+выделяется точного размера и заполняется вторым проходом - память не растёт с блоками.
+"""
+import re
+import warnings
+import numpy as np
+from csr import CSR
+
+CHUNK_EDGES = 1 << 20  # рёбер в одном блоке
+_COMMENT = re.compile(rb'#[^\n]*')
+
+
+def _parse(block, first_line=1):
+    """Концы рёбер блока целых строк: первые два столбца каждой строки (остальные - например,
+    веса - отбрасываются), пустые строки пропускаются. first_line - номер первой строки блока"""
+    if b'#' in block:
+        block = _COMMENT.sub(b'', block)  # перевод строки остаётся - номера строк не сдвигаются
+    data = np.frombuffer(block, dtype=np.uint8)
+    space = data <= ord(' ')  # пробел, табуляция, перевод строки
+    starts = np.flatnonzero(~space & np.r_[True, space[:-1]])  # первые байты полей
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    line_end = np.flatnonzero(data == ord('\n'))
+    counts = np.diff(np.r_[0, np.searchsorted(starts, line_end), len(starts)])  # полей в каждой строке
+    if (counts == 1).any():
+        raise ValueError(f"строка {first_line + int(np.argmax(counts == 1))}: ожидалось два номера вершин")
+    if (counts > 2).any():  # с третьего поля до конца строки - пробелы
+        field_line = np.repeat(np.arange(len(counts)), counts)
+        column = np.arange(len(starts)) - np.repeat(np.cumsum(counts) - counts, counts)
+        third = column == 2
+        stop = np.r_[line_end, len(data)][field_line[third]]
+        blank = np.zeros(len(data) + 1, dtype=np.int32)
+        blank[starts[third]] += 1
+        blank[stop] -= 1
+        data = np.where(np.cumsum(blank[:-1]) > 0, np.uint8(ord(' ')), data)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)  # старые numpy только предупреждают
+            values = np.fromstring(data.tobytes(), dtype=np.int64, sep=' ')
+    except (ValueError, DeprecationWarning):
+        values = np.zeros(0, dtype=np.int64)
+    if len(values) != 2 * int((counts > 0).sum()):
+        raise ValueError(f"строка {first_line + _bad_line(data)}: номера вершин должны быть целыми")
+    pairs = values.reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _bad_line(data):
+    """Номер (от 0) первой строки с нецелым полем - только для сообщения об ошибке"""
+    for number, line in enumerate(data.tobytes().split(b'\n')):
+        for field in line.split():
+            try:
+                int(field)
+            except ValueError:
+                return number
+    return 0
+
+
+def text_chunks(path, chunk_edges=CHUNK_EDGES):
+    """Концы рёбер (src, dst) текстового файла блоками примерно по chunk_edges рёбер"""
+    with open(path, 'rb') as f:
+        tail = b''
+        first_line = 1
+        while True:
+            block = f.read(chunk_edges * 16)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b'\n') + 1  # блок кончается на целой строке
+            block, tail = block[:cut], block[cut:]
+            if block:
+                yield _parse(block, first_line)
+                first_line += block.count(b'\n')
+        if tail.strip():
+            yield _parse(tail, first_line)
+
+
+def binary_chunks(path, dtype=np.int32, chunk_edges=CHUNK_EDGES):
+    """Концы рёбер бинарного файла пар (src, dst) срезами отображённого в память массива"""
+    data = np.memmap(path, dtype=dtype, mode='r')
+    pairs = data[:len(data) // 2 * 2].reshape(-1, 2)
+    for start in range(0, len(pairs), chunk_edges):
+        part = pairs[start:start + chunk_edges]
+        yield part[:, 0], part[:, 1]
+
+
+def _degree_pass(chunks):
+    """Первый проход: степени по меткам вершин (метки - неотрицательные целые)"""
+    degree = np.zeros(0, dtype=np.int64)
+    for src, dst in chunks():
+        if not len(src):
+            continue
+        if min(src.min(), dst.min()) < 0:
+            raise ValueError("для подсчёта степеней метки вершин должны быть неотрицательными")
+        top = int(max(src.max(), dst.max())) + 1
+        if top > len(degree):
+            degree = np.concatenate([degree, np.zeros(top - len(degree), dtype=np.int64)])
+        degree += np.bincount(src, minlength=len(degree))
+        degree += np.bincount(dst, minlength=len(degree))
+    return degree
+
+
+def _fill(chunks, relabel, offsets):
+    """Второй проход: соседи каждого блока ставятся на свои места в готовом массиве"""
+    neighbors = np.empty(offsets[-1], dtype=np.int64)
+    cursor = offsets[:-1].copy()  # следующая свободная позиция в строке вершины
+    for src, dst in chunks():
+        if not len(src):
+            continue
+        src, dst = relabel[src], relabel[dst]
+        heads = np.concatenate([src, dst])
+        tails = np.concatenate([dst, src])
+        order = np.argsort(heads)  # порядок внутри строки не важен - сортировка без устойчивости
+        heads, tails = heads[order], tails[order]
+        starts = np.flatnonzero(np.r_[True, heads[1:] != heads[:-1]])
+        counts = np.diff(np.r_[starts, len(heads)])
+        rank = np.arange(len(heads)) - np.repeat(starts, counts)  # номер среди соседей той же вершины
+        neighbors[cursor[heads] + rank] = tails
+        cursor[heads[starts]] += counts
+    return neighbors
+
+
+def build_csr(chunks, count_first=False):
+    """CSR и отсортированные метки вершин; chunks() при каждом вызове заново отдаёт блоки рёбер.
+    Вершина с номером i в CSR - labels[i]; в граф попадают только вершины с рёбрами"""
+    if count_first:
+        degree = _degree_pass(chunks)
+        present = degree > 0
+        labels = np.flatnonzero(present)
+        relabel = np.cumsum(present) - 1
+        offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(degree[present], out=offsets[1:])
+        return CSR(offsets, _fill(chunks, relabel, offsets)), labels
+    parts = list(chunks())
+    src = np.concatenate([s for s, d in parts] or [np.zeros(0, dtype=np.int64)]).astype(np.int64)
+    dst = np.concatenate([d for s, d in parts] or [np.zeros(0, dtype=np.int64)]).astype(np.int64)
+    labels = np.unique(np.concatenate([src, dst]))
+    return CSR.from_edges(len(labels), np.searchsorted(labels, src), np.searchsorted(labels, dst)), labels
+
+
+def load_edge_list(path, count_first=False, chunk_edges=CHUNK_EDGES):
+    """CSR и метки вершин из текстового списка рёбер"""
+    return build_csr(lambda: text_chunks(path, chunk_edges), count_first)
+
+
+def load_binary(path, dtype=np.int32, count_first=True, chunk_edges=CHUNK_EDGES):
+    """CSR и метки вершин из бинарного файла пар int32/int64"""
+    return build_csr(lambda: binary_chunks(path, dtype, chunk_edges), count_first)
@@ -0,0 +1,28 @@
+def canonical(edge):
+    """Ключ неориентированного ребра: (min, max)"""
+    u, v = edge
+    return (u, v) if u <= v else (v, u)
+
+
+class EdgeStore:
+    """Множество рёбер с ключом (min, max): проверка ребра в любой ориентации за O(1)"""
+
+    def __init__(self, edges=()):
+        self.keys = set()
+        for edge in edges:
+            self.keys.add(canonical(edge))
+
+    def __contains__(self, edge):
+        return canonical(edge) in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def add(self, edge):
+        self.keys.add(canonical(edge))
+
+    def discard(self, edge):
+        self.keys.discard(canonical(edge))
@@ -0,0 +1,141 @@
+"""Объединение, пересечение и кольцевая сумма графов как OR / AND / XOR битовых матриц смежности.
+
+Матрицы строятся над общей нумерацией вершин (отсортированное объединение множеств вершин),
+рёбра понимаются как множество неупорядоченных пар (для простых графов - то же, что
+у операций Graph). Результат - MatrixGraph: степени и проверка ребра берутся прямо из битов,
+обычный граф собирается только в to_graph(). batch() применяет одну операцию
+сразу ко многим парам графов одной операцией numpy над стопкой матриц.
+"""
+import numpy as np
+from bitrel import BitRelation, WORD, pack_rows, popcount
+from csr import CSR
+
+DENSE_PACK_MAX = 1 << 26  # до стольких клеток матрицу выгоднее заполнить целиком и упаковать
+
+OPERATIONS = {
+    'union': (np.bitwise_or, 'Объединение'),
+    'intersection': (np.bitwise_and, 'Пересечение'),
+    'ring_sum': (np.bitwise_xor, 'Кольцевая сумма'),
+}
+
+
+def aligned_order(g1, g2):
+    """Общая нумерация вершин двух графов"""
+    if g1.order == g2.order:
+        return g1.order
+    return sorted(set(g1.order) | set(g2.order))
+
+
+def adjacency_bits(graph, order=None):
+    """Битовая матрица смежности graph в нумерации order (по умолчанию graph.order)"""
+    csr = graph.csr
+    rows = np.repeat(np.arange(csr.n), csr.degrees())
+    cols = csr.neighbors
+    if order is None or order is graph.order or order == graph.order:
+        n = graph.n
+    else:
+        position = np.searchsorted(order, graph.order)
+        rows, cols, n = position[rows], position[cols], len(order)
+    if n * n <= DENSE_PACK_MAX:
+        matrix = np.zeros((n, n), dtype=bool)
+        matrix[rows, cols] = True
+        return BitRelation(n, pack_rows(matrix, (n + 63) // 64))
+    rel = BitRelation(n)
+    rel.set_bits(rows, cols)
+    return rel
+
+
+def _set_pairs(words):
+    """Пары (i, j), i <= j, единичных битов матрицы - через ненулевые слова, без распаковки всей матрицы"""
+    r, w = np.nonzero(words)
+    if len(r) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    bits = np.unpackbits(words[r, w].view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    k, b = np.nonzero(bits)
+    rows, cols = r[k], w[k] * 64 + b
+    upper = rows <= cols
+    return rows[upper], cols[upper]
+
+
+class MatrixGraph:
+    """Результат матричной операции: битовая матрица над order и множество вершин результата"""
+
+    def __init__(self, order, vertices, bits, name, graph_class=None, layout_cache=None):
+        self.order = order
+        self.vertices = vertices
+        self.bits = bits
+        self.name = name
+        self.graph_class = graph_class
+        self.layout_cache = layout_cache
+        self._graph = None
+
+    @property
+    def n(self):
+        return len(self.vertices)
+
+    def has_edge(self, u, v):
+        i, j = np.searchsorted(self.order, [u, v])
+        if i >= len(self.order) or j >= len(self.order) or self.order[i] != u or self.order[j] != v:
+            return False
+        return bool(self.bits[i, j])
+
+    def get_degrees(self):
+        """Степени по числу битов строки (петля считается дважды, как в Graph)"""
+        counts = popcount(self.bits.words, axis=1) + self.bits.diagonal().astype(np.int64)
+        index = {v: i for i, v in enumerate(self.order)}
+        return {v: int(counts[index[v]]) for v in self.vertices}
+
+    def num_edges(self):
+        return (self.bits.count() + int(self.bits.diagonal().sum())) // 2
+
+    def to_graph(self):
+        """Обычный граф (рёбра - из CSR при первом обращении)"""
+        if self._graph is None:
+            rows, cols = _set_pairs(self.bits.words)
+            result = sorted(self.vertices)
+            if len(result) == len(self.order):
+                keep = np.arange(len(self.order))
+            else:  # у пересечения вершин меньше, чем в общей нумерации
+                keep = np.cumsum(np.isin(self.order, result)) - 1
+            csr = CSR.from_edges(len(result), keep[rows], keep[cols])
+            self._graph = self.graph_class.from_csr(csr, result, self.name)
+            if self.layout_cache is not None:
+                self._graph.layout_cache = self.layout_cache
+        return self._graph
+
+
+def _result_vertices(operation, g1, g2):
+    if operation == 'intersection':
+        return list(set(g1.vertices) & set(g2.vertices))
+    return list(set(g1.vertices + g2.vertices))
+
+
+def apply(operation, g1, g2):
+    """Операция 'union', 'intersection' или 'ring_sum' над парой графов"""
+    return batch(operation, [(g1, g2)])[0]
+
+
+def batch(operation, pairs):
+    """Одна операция над многими парами графов; пары с одинаковой общей нумерацией
+    обрабатываются одним вызовом numpy над стопкой матриц"""
+    ufunc, title = OPERATIONS[operation]
+    pairs = list(pairs)
+    groups = {}
+    for t, (g1, g2) in enumerate(pairs):
+        order = aligned_order(g1, g2)
+        groups.setdefault(tuple(order), (order, []))[1].append(t)
+    results = [None] * len(pairs)
+    for order, members in groups.values():
+        n = len(order)
+        left = np.empty((len(members), n, (n + 63) // 64), dtype=WORD)
+        right = np.empty_like(left)
+        for k, t in enumerate(members):
+            g1, g2 = pairs[t]
+            left[k] = adjacency_bits(g1, order).words
+            right[k] = adjacency_bits(g2, order).words
+        stacked = ufunc(left, right)
+        for k, t in enumerate(members):
+            g1, g2 = pairs[t]
+            results[t] = MatrixGraph(order, _result_vertices(operation, g1, g2), BitRelation(n, stacked[k]),
+                                     f"{title} {g1.name} и {g2.name}", type(g1), getattr(g1, 'layout_cache', None))
+    return results
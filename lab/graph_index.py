@@ -0,0 +1,147 @@
+"""Индекс коллекции графов для поиска изоморфных без сравнения всех пар.
+
+Графы раскладываются по корзинам с ключом-отпечатком: поля get_graph_invariants
+и хэш следа уточнения раскраски. Точная проверка (сравнение канонических форм)
+идёт только внутри корзины, а для единственного графа корзины не выполняется вовсе.
+
+    index = GraphIndex()
+    index.insert_many(graphs, workers=8)
+    index.find_isomorphic(g)  # ключи изоморфных g графов
+    index.save('graphs.idx'); index = GraphIndex.load('graphs.idx')
+"""
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from csr import CSR
+from invariants import InvariantCache
+from isomorphism import canonical_labeling, refinement_hash
+
+
+class PackedGraph:
+    """Граф только из CSR (вершины 0..n-1) - так графы передаются в процессы пула"""
+
+    def __init__(self, offsets, neighbors):
+        self.csr = CSR(offsets, neighbors)
+        self.order = self.vertices = list(range(self.csr.n))
+        self.index = {v: v for v in self.order}
+        self.invariants = InvariantCache(self)
+
+
+def fingerprint(graph):
+    """Отпечаток графа (Graph, GraphView, PackedGraph): равен у изоморфных графов"""
+    if not graph.vertices:
+        return (0,)
+    cache = graph.invariants
+    return (len(graph.vertices), len(graph.csr.neighbors) // 2, tuple(cache.get('degree_sequence')),
+            cache.get('num_components'), cache.get('diameter'), refinement_hash(graph))
+
+
+def certificate(graph):
+    return canonical_labeling(graph)[1]
+
+
+def _pack(graph):
+    """Компактная форма графа: массивы CSR, соседи в int32, если номера помещаются"""
+    csr = graph.csr
+    neighbors = csr.neighbors
+    if csr.n < 2 ** 31:
+        neighbors = neighbors.astype(np.int32)
+    return csr.offsets, neighbors
+
+
+def _signature(packed):
+    """Работа одного процесса при массовой вставке: отпечаток и сертификат"""
+    graph = PackedGraph(*packed)
+    return fingerprint(graph), certificate(graph)
+
+
+class GraphIndex:
+    """Корзины по отпечаткам; в корзине - классы изоморфизма {сертификат: [ключи]}"""
+
+    def __init__(self):
+        self.buckets = {}
+        self.pending = {}  # отпечаток -> (массивы CSR, ключи): класс один, сертификат ещё не нужен
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _bucket(self, fp):
+        """Корзина с досчитанным сертификатом отложенного графа"""
+        if fp in self.pending:
+            packed, keys = self.pending.pop(fp)
+            self.buckets[fp] = {certificate(PackedGraph(*packed)): keys}
+        return self.buckets.get(fp)
+
+    def _add(self, fp, cert, key):
+        bucket = self._bucket(fp)
+        if bucket is None:
+            bucket = self.buckets[fp] = {}
+        bucket.setdefault(cert, []).append(key)
+        self.size += 1
+
+    def insert(self, graph, key=None):
+        """Добавление графа; key по умолчанию - порядковый номер. Возвращает key"""
+        if key is None:
+            key = self.size
+        fp = fingerprint(graph)
+        if fp not in self.buckets and fp not in self.pending:
+            self.pending[fp] = (_pack(graph), [key])  # не весь граф - только его CSR
+            self.size += 1
+        else:
+            self._add(fp, certificate(graph), key)
+        return key
+
+    def insert_many(self, graphs, keys=None, workers=None, chunksize=256):
+        """Массовая вставка; workers - считать отпечатки и сертификаты в пуле процессов"""
+        graphs = list(graphs)
+        if keys is None:
+            keys = range(self.size, self.size + len(graphs))
+        if not workers:
+            for graph, key in zip(graphs, keys):
+                self.insert(graph, key)
+            return
+        packed = [_pack(graph) for graph in graphs]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (fp, cert), key in zip(pool.map(_signature, packed, chunksize=chunksize), keys):
+                self._add(fp, cert, key)
+
+    def find_isomorphic(self, graph):
+        """Ключи всех графов индекса, изоморфных graph"""
+        fp = fingerprint(graph)
+        bucket = self._bucket(fp)
+        if bucket is None:
+            return []
+        return list(bucket.get(certificate(graph), []))
+
+    def __contains__(self, graph):
+        return bool(self.find_isomorphic(graph))
+
+    def classes(self):
+        """Классы изоморфизма - списки ключей"""
+        for packed, keys in self.pending.values():
+            yield list(keys)
+        for bucket in self.buckets.values():
+            for keys in bucket.values():
+                yield list(keys)
+
+    def representatives(self):
+        """По одному ключу на класс изоморфизма (дедупликация коллекции)"""
+        return [keys[0] for keys in self.classes()]
+
+    def save(self, path):
+        """Запись на диск; отложенные сертификаты досчитываются, графы не сохраняются"""
+        for fp in list(self.pending):
+            self._bucket(fp)
+        with open(path, 'wb') as f:
+            pickle.dump({'buckets': self.buckets, 'size': self.size}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        index = cls()
+        index.buckets = data['buckets']
+        index.size = data['size']
+        return index
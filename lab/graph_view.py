@@ -0,0 +1,172 @@
+import numpy as np
+from csr import CSR
+from edge_store import canonical
+from invariants import InvariantCache, InvariantsMixin
+
+
+class GraphView(InvariantsMixin):
+    """Производный граф поверх общего базового графа: хранится только дельта -
+    удалённые вершины и рёбра базы и карта отождествлённых вершин.
+    Операции возвращают новый вид за O(размер дельты), граф строится лишь в to_graph()"""
+
+    def __init__(self, base, name=None):
+        self.base = base
+        self.name = base.name if name is None else name
+        self.removed_vertices = set()  # вершины базы
+        self.removed_edges = set()  # канонические рёбра базы
+        self.merged = {}  # вершина базы -> вершина вида, в которую она вошла
+        self.classes = {}  # вершина вида -> все вершины базы, слитые в неё
+        self.simplified = False  # было ли отождествление
+        self._csr = None
+        self._vertices = None
+        self._index = None
+        self.invariants = InvariantCache(self)  # вид не меняется - кэш живёт вместе с ним
+
+    def _derive(self, name):
+        view = GraphView(self.base, name)
+        view.removed_vertices = set(self.removed_vertices)
+        view.removed_edges = set(self.removed_edges)
+        view.merged = dict(self.merged)
+        view.classes = {v: list(members) for v, members in self.classes.items()}
+        view.simplified = self.simplified
+        return view
+
+    def rep(self, v):
+        return self.merged.get(v, v)
+
+    def members(self, v):
+        return self.classes.get(v, [v])
+
+    @property
+    def vertices(self):
+        if self._vertices is None:
+            self._vertices = [v for v in self.base.vertices
+                              if v not in self.removed_vertices and v not in self.merged]
+        return self._vertices
+
+    @property
+    def n(self):
+        return len(self.vertices)
+
+    def __contains__(self, v):
+        return v in self.base.index and v not in self.removed_vertices and v not in self.merged
+
+    def _base_neighbors(self, v):
+        """Пары (вершина базы a из класса v, её сосед b в базе) для живых рёбер"""
+        for a in self.members(v):
+            for b in self.base.neighbors(a):
+                if b not in self.removed_vertices and canonical((a, b)) not in self.removed_edges:
+                    yield a, b
+
+    def neighbors(self, v):
+        result = [self.rep(b) for _, b in self._base_neighbors(v)]
+        if self.simplified:  # после отождествления кратных рёбер и петель нет, как в Graph
+            result = list(dict.fromkeys(w for w in result if w != v))
+        return result
+
+    def has_edge(self, u, v):
+        return u in self and v in self and v in self.neighbors(u)
+
+    @property
+    def edges(self):
+        """Рёбра вида в том же порядке и виде, что дала бы цепочка операций Graph"""
+        edges = []
+        seen = set()
+        for a, b in self.base.edges:
+            if a in self.removed_vertices or b in self.removed_vertices:
+                continue
+            if canonical((a, b)) in self.removed_edges:
+                continue
+            if not self.simplified:
+                edges.append((a, b))
+                continue
+            a, b = self.rep(a), self.rep(b)
+            if a != b and (min(a, b), max(a, b)) not in seen:
+                seen.add((min(a, b), max(a, b)))
+                edges.append((min(a, b), max(a, b)))
+        return edges
+
+    # ОПЕРАЦИИ - только изменение дельты
+    def remove_edge(self, edge):
+        """Удаление ребра"""
+        u, v = edge
+        view = self._derive(f"{self.name} без ребра {edge}")
+        if u in self and v in self:
+            for a, b in self._base_neighbors(u):
+                if self.rep(b) == v:
+                    view.removed_edges.add(canonical((a, b)))
+        return view
+
+    def remove_vertex(self, vertex):
+        """Удаление вершины"""
+        view = self._derive(f"{self.name} без вершины {vertex}")
+        if vertex in self:
+            view.removed_vertices.update(self.members(vertex))
+        return view
+
+    def identify_vertices(self, u, v):
+        """Отождествление вершин"""
+        if u not in self or v not in self:
+            raise ValueError(f"вершин {u} и {v} должны быть в графе {self.name}")
+        new_vertex, remaining_vertex = min(u, v), max(u, v)
+        view = self._derive(f"{self.name} с отождествлением {u} и {v}")
+        if u != v:
+            moved = view.classes.pop(remaining_vertex, [remaining_vertex])
+            for a in moved:
+                view.merged[a] = new_vertex
+            view.classes[new_vertex] = view.members(new_vertex) + moved
+        view.simplified = True
+        return view
+
+    def contract_edge(self, edge):
+        """Стягивание ребра"""
+        return self.identify_vertices(edge[0], edge[1])
+
+    # ОБХОДЫ И ИНВАРИАНТЫ - через компактный CSR вида, без плотной матрицы
+    @property
+    def order(self):
+        return [v for v in self.base.order if v in self]
+
+    @property
+    def csr(self):
+        if self._csr is None:
+            self._csr = self._build_csr()
+        return self._csr
+
+    def _build_csr(self):
+        base = self.base
+        src, dst = base.edge_ends
+        alive = np.ones(base.n, dtype=bool)
+        alive[[base.index[v] for v in self.removed_vertices]] = False
+        rep = np.arange(base.n)
+        for a, v in self.merged.items():
+            rep[base.index[a]] = base.index[v]
+        keep = alive[src] & alive[dst]
+        if self.removed_edges:
+            removed = np.array([[base.index[a], base.index[b]] for a, b in self.removed_edges])
+            keys = np.minimum(src, dst) * base.n + np.maximum(src, dst)
+            keep &= ~np.isin(keys, removed.min(axis=1) * base.n + removed.max(axis=1))
+        src, dst = rep[src[keep]], rep[dst[keep]]
+        if self.simplified:
+            loop = src == dst
+            pairs = np.unique(np.stack([np.minimum(src, dst), np.maximum(src, dst)])[:, ~loop], axis=1)
+            src, dst = pairs
+        present = alive & (rep == np.arange(base.n))  # индексы вида идут в порядке base.order
+        compact = np.cumsum(present) - 1
+        return CSR.from_edges(int(present.sum()), compact[src], compact[dst])
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {v: i for i, v in enumerate(self.order)}
+        return self._index
+
+    def to_graph(self):
+        """Материализация в обычный граф того же класса, что и база"""
+        graph = type(self.base)(list(self.vertices), self.edges, self.name)
+        graph.layout_cache = self.base.layout_cache
+        return graph
+
+    def __repr__(self):
+        return (f"GraphView({self.name!r}, -{len(self.removed_vertices)} вершин, "
+                f"-{len(self.removed_edges)} рёбер, {len(self.merged)} слито)")
@@ -0,0 +1,206 @@
+"""Неявные графы: дополнение и соединение без построения O(V^2) рёбер.
+
+Смежность, степени, соседи и BFS считаются по простому CSR исходных графов.
+BFS по дополнению идёт с множеством ещё не посещённых вершин: за уровень
+вершина остаётся непосещённой, только если в исходном графе смежна со всем фронтом,
+так что каждое её "пропускание" оплачено ребром исходного графа - всего O(V + E).
+Рёбра строятся только в to_graph().
+"""
+import numpy as np
+from csr import CSR
+from invariants import InvariantCache, InvariantsMixin
+
+
+def simple_csr(n, src, dst):
+    """CSR без петель и кратных рёбер"""
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    keep = src != dst
+    keys = np.unique(np.minimum(src, dst)[keep] * n + np.maximum(src, dst)[keep])
+    return CSR.from_edges(n, keys // n, keys % n)
+
+
+class ImplicitSearch:
+    """Обходы неявного графа с вершинами 0..n-1; подклассы задают шаг _reached"""
+
+    def __init__(self, n, base):
+        self.n = n
+        self.base = base  # простой CSR рёбер исходных графов
+        self._count = np.zeros(n, dtype=np.int64)
+
+    def _reached(self, frontier, rest):
+        """Маска вершин rest, смежных хотя бы с одной вершиной фронта"""
+        raise NotImplementedError
+
+    def _base_hits(self, frontier, rest):
+        """Сколько вершин фронта смежны в исходном графе с каждой вершиной rest"""
+        nb = self.base.gather(frontier)
+        np.add.at(self._count, nb, 1)
+        hits = self._count[rest]
+        self._count[nb] = 0
+        return hits
+
+    def _search(self, start, rest):
+        """Уровни BFS из start по вершинам rest и непосещённый остаток"""
+        levels = []
+        frontier = np.array([start], dtype=np.int64)
+        while len(frontier) and len(rest):
+            reached = self._reached(frontier, rest)
+            frontier, rest = rest[reached], rest[~reached]
+            if len(frontier):
+                levels.append(frontier)
+        return levels, rest
+
+    def bfs(self, start):
+        """Расстояния от start (-1 - недостижима)"""
+        dist = np.full(self.n, -1, dtype=np.int64)
+        dist[start] = 0
+        levels, _ = self._search(start, np.delete(np.arange(self.n), start))
+        for level, frontier in enumerate(levels, 1):
+            dist[frontier] = level
+        return dist
+
+    def components(self):
+        """Метки компонент связности и их число"""
+        labels = np.full(self.n, -1, dtype=np.int64)
+        rest = np.arange(self.n)
+        count = 0
+        while len(rest):
+            start, rest = rest[0], rest[1:]
+            labels[start] = count
+            levels, rest = self._search(start, rest)
+            for frontier in levels:
+                labels[frontier] = count
+            count += 1
+        return labels, count
+
+
+class ComplementSearch(ImplicitSearch):
+    def _reached(self, frontier, rest):
+        return self._base_hits(frontier, rest) < len(frontier)
+
+    def degrees(self):
+        return np.maximum(self.n - 1 - self.base.degrees(), 0)
+
+    def neighbors_of(self, i):
+        mask = np.ones(self.n, dtype=bool)
+        mask[self.base.neighbors_of(i)] = False
+        mask[i] = False
+        return np.flatnonzero(mask)
+
+
+class JoinSearch(ImplicitSearch):
+    """Рёбра обоих графов и все пары u из первого, v из второго, u != v"""
+
+    def __init__(self, n, base, in1, in2):
+        super().__init__(n, base)
+        self.in1 = in1
+        self.in2 = in2
+
+    def _cross(self, side, frontier, rest):
+        """Вершины rest, до которых фронт достаёт перекрёстным ребром со стороны side"""
+        sources = frontier[side[frontier]]
+        if len(sources) == 0:
+            return np.zeros(len(rest), dtype=bool)
+        return rest != sources[0] if len(sources) == 1 else np.ones(len(rest), dtype=bool)
+
+    def _reached(self, frontier, rest):
+        reached = self._base_hits(frontier, rest) > 0
+        reached |= self.in2[rest] & self._cross(self.in1, frontier, rest)
+        reached |= self.in1[rest] & self._cross(self.in2, frontier, rest)
+        return reached
+
+    def _cross_mask(self, i):
+        mask = (self.in2 if self.in1[i] else np.zeros(self.n, dtype=bool)) | \
+               (self.in1 if self.in2[i] else np.zeros(self.n, dtype=bool))
+        mask[i] = False
+        return mask
+
+    def degrees(self):
+        rows = np.repeat(np.arange(self.n), self.base.degrees())
+        cols = self.base.neighbors
+        crossing = (self.in1[rows] & self.in2[cols]) | (self.in2[rows] & self.in1[cols])
+        own = np.bincount(rows[~crossing], minlength=self.n)  # рёбра, не совпавшие с перекрёстными
+        n1, n2 = int(self.in1.sum()), int(self.in2.sum())
+        cross = np.where(self.in1 & self.in2, self.n - 1, np.where(self.in1, n2, n1))
+        return own + cross
+
+    def neighbors_of(self, i):
+        mask = self._cross_mask(i)
+        mask[self.base.neighbors_of(i)] = True
+        return np.flatnonzero(mask)
+
+
+class ImplicitGraph(InvariantsMixin):
+    """Общая часть неявных графов: вершины, номера, инварианты через InvariantCache"""
+
+    def __init__(self, vertices, csr, name):
+        self.vertices = vertices
+        self.name = name
+        self.n = len(vertices)
+        self.order = sorted(vertices)
+        self.index = {v: i for i, v in enumerate(self.order)}
+        self.csr = csr  # неявный поиск с интерфейсом CSR: degrees, bfs, components
+        self.invariants = InvariantCache(self)
+
+    def __contains__(self, v):
+        return v in self.index
+
+    def neighbors(self, v):
+        return [self.order[i] for i in self.csr.neighbors_of(self.index[v])]
+
+    def edge_list(self):
+        """Все рёбра неявного графа (каждое один раз, u < v по номерам) - O(V^2)"""
+        edges = []
+        for i in range(self.n):
+            nb = self.csr.neighbors_of(i)
+            edges.extend((self.order[i], self.order[j]) for j in nb[nb > i].tolist())
+        return edges
+
+
+class ComplementGraph(ImplicitGraph):
+    """Дополнение графа base: u и v смежны, если u != v и в base ребра нет"""
+
+    def __init__(self, base):
+        src, dst = base.edge_ends
+        super().__init__(base.vertices, ComplementSearch(base.n, simple_csr(base.n, src, dst)),
+                         f"Дополнение {base.name}")
+        self.base = base
+
+    def has_edge(self, u, v):
+        return u != v and u in self and v in self and not self.base.has_edge(u, v)
+
+    def to_graph(self):
+        return self.base.complement()
+
+
+class JoinGraph(ImplicitGraph):
+    """Соединение графов g1 и g2: их рёбра и все пары (u из g1, v из g2), u != v"""
+
+    def __init__(self, g1, g2):
+        vertices = list(set(g1.vertices + g2.vertices))
+        order = sorted(vertices)
+        n = len(order)
+        pos1 = np.searchsorted(order, g1.order) if g1.n else np.zeros(0, dtype=np.int64)
+        pos2 = np.searchsorted(order, g2.order) if g2.n else np.zeros(0, dtype=np.int64)
+        in1 = np.zeros(n, dtype=bool)
+        in2 = np.zeros(n, dtype=bool)
+        in1[pos1] = True
+        in2[pos2] = True
+        (s1, d1), (s2, d2) = g1.edge_ends, g2.edge_ends
+        base = simple_csr(n, np.concatenate([pos1[s1], pos2[s2]]), np.concatenate([pos1[d1], pos2[d2]]))
+        super().__init__(vertices, JoinSearch(n, base, in1, in2), f"Соединение {g1.name} и {g2.name}")
+        self.g1 = g1
+        self.g2 = g2
+
+    def has_edge(self, u, v):
+        if u == v or u not in self or v not in self:
+            return False
+        if (u in self.g1.index and v in self.g2.index) or (u in self.g2.index and v in self.g1.index):
+            return True
+        return (u in self.g1.index and self.g1.has_edge(u, v)) or (u in self.g2.index and self.g2.has_edge(u, v))
+
+    def to_graph(self):
+        """Обычный граф с теми же рёбрами: без петель и повторов, в отличие от Graph.join,
+        который при общих вершинах g1 и g2 добавляет петли (v, v) и обе ориентации пары"""
+        return self.g1._derive(list(self.vertices), self.edge_list(), self.name, self.g2)
@@ -0,0 +1,100 @@
+import numpy as np
+from bitrel import BitRelation, ONE, WORD
+from closure import CLOSURES
+
+
+class IncrementalClosure:
+    """Замыкание отношения на {1..n}, поддерживаемое при добавлении и удалении пар.
+    base - само отношение, closure - его замыкание вида kind (оба BitRelation)"""
+
+    def __init__(self, rel, kind='transitive'):
+        if kind not in CLOSURES:
+            raise ValueError(f"неизвестный вид замыкания: {kind}")
+        self.kind = kind
+        self.base = rel.copy()
+        self.closure = CLOSURES[kind](self.base)
+
+    @classmethod
+    def from_pairs(cls, pairs, n, kind='transitive'):
+        return cls(BitRelation.from_pairs(pairs, n), kind)
+
+    @property
+    def n(self):
+        return self.base.n
+
+    def __contains__(self, pair):
+        x, y = pair
+        return self.closure[x - 1, y - 1]
+
+    def add(self, x, y):
+        """Добавление пары (x, y); затрагиваются только строки, из которых достижим x"""
+        a, b = x - 1, y - 1
+        if self.base[a, b]:
+            return
+        self.base[a, b] = True
+        if self.kind != 'transitive':
+            self.closure[a, b] = True
+            if self.kind == 'symmetric':
+                self.closure[b, a] = True
+            return
+        if self.closure[a, b]:
+            return
+        row = self.closure.words[b].copy()
+        row[b >> 6] |= ONE << np.uint64(b & 63)
+        rows = self.closure.column(a)
+        rows[a] = True
+        self.closure.words[rows] |= row
+
+    def remove(self, x, y):
+        """Удаление пары (x, y) с восстановлением строк, которые могли через неё проходить"""
+        a, b = x - 1, y - 1
+        if not self.base[a, b]:
+            return
+        self.base[a, b] = False
+        if self.kind == 'reflexive':
+            if a != b:
+                self.closure[a, b] = False
+        elif self.kind == 'symmetric':
+            if not self.base[b, a]:
+                self.closure[a, b] = False
+                self.closure[b, a] = False
+        else:
+            self._repair(a)
+
+    def _repair(self, a):
+        # Пересчитываются строки S = {a} ∪ {i: i достигает a}. Строка вершины вне S
+        # осталась верной: её пути не проходили через a. Из вершины вне S нельзя
+        # попасть в S, поэтому новые строки S = рёбра base + готовые строки вне S,
+        # замкнутые алгоритмом Уоршелла только по вершинам S
+        affected = self.closure.column(a)
+        affected[a] = True
+        rows = np.flatnonzero(affected)
+        position = np.full(self.n, -1, dtype=np.int64)
+        position[rows] = np.arange(len(rows))
+        fresh = np.zeros((len(rows), self.base.n_words), dtype=WORD)
+        for t, i in enumerate(rows):
+            succ = self.base.row(i)
+            if not len(succ):
+                continue
+            np.bitwise_or.at(fresh[t], succ >> 6, ONE << (succ & 63).astype(WORD))
+            outside = succ[~affected[succ]]
+            if len(outside):
+                fresh[t] |= np.bitwise_or.reduce(self.closure.words[outside], axis=0)
+        for k in rows:
+            has = ((fresh[:, k >> 6] >> np.uint64(k & 63)) & ONE).astype(bool)
+            fresh[has] |= fresh[position[k]]
+        self.closure.words[rows] = fresh
+
+    def add_pairs(self, pairs):
+        for x, y in pairs:
+            self.add(x, y)
+
+    def remove_pairs(self, pairs):
+        for x, y in pairs:
+            self.remove(x, y)
+
+    def to_matrix(self, dtype=int):
+        return self.closure.to_matrix(dtype)
+
+    def __repr__(self):
+        return f"IncrementalClosure({self.kind}, n={self.n}, pairs={self.closure.count()})"
@@ -0,0 +1,133 @@
+from collections import Counter
+from diameter import bitparallel_eccentricities, choose_method, eccentricities, ifub_diameter
+
+
+class InvariantCache:
+    """Инварианты графа (Graph или GraphView), посчитанные один раз.
+    Связанные величины получаются одним проходом: компоненты дают связность и их число,
+    эксцентриситеты - диаметр. Кэш сбрасывается, когда меняется graph.version.
+    hits / misses - сколько раз величина отдана из кэша / вычислена по запросу"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.values = {}
+        self.version = getattr(graph, 'version', 0)
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def invalidate(self):
+        self.values.clear()
+
+    def cached(self, name):
+        """Есть ли величина в кэше для текущей версии графа"""
+        self._check_version()
+        return name in self.values
+
+    def _check_version(self):
+        version = getattr(self.graph, 'version', 0)
+        if version != self.version:
+            self.version = version
+            self.invalidate()
+
+    def get(self, name, **options):
+        """Значение инварианта; значения общие для всех вызовов - их нельзя изменять"""
+        self._check_version()
+        if name in self.values:
+            self.hits[name] += 1
+        else:
+            self.misses[name] += 1
+            getattr(self, '_compute_' + name)(**options)
+        return self.values[name]
+
+    def stats(self):
+        return {'hits': dict(self.hits), 'misses': dict(self.misses)}
+
+    # ВЫЧИСЛЕНИЯ - каждое заполняет все величины, которые даёт его проход
+    def _compute_degrees(self):
+        graph = self.graph
+        degrees = graph.csr.degrees()
+        self.values['degrees'] = {v: int(degrees[graph.index[v]]) for v in graph.vertices}
+
+    def _compute_degree_sequence(self):
+        degrees = self.get('degrees')
+        self.values['degree_sequence'] = sorted(degrees.values(), reverse=True)
+
+    def _compute_components(self):
+        graph = self.graph
+        disjoint_set = getattr(graph, 'disjoint_set', None)  # у Graph компоненты уже поддерживаются
+        if disjoint_set is not None:
+            self.values['components'] = disjoint_set.groups(graph.vertices)
+        else:
+            labels, count = graph.csr.components()
+            components = {}
+            for vertex in graph.vertices:  # компоненты в порядке первой вершины
+                components.setdefault(labels[graph.index[vertex]], []).append(vertex)
+            self.values['components'] = list(components.values())
+        components = self.values['components']
+        self.values['num_components'] = len(components)
+        self.values['is_connected'] = len(components) <= 1
+
+    _compute_num_components = _compute_is_connected = _compute_components
+
+    def _store_eccentricities(self, ecc):
+        graph = self.graph
+        self.values['eccentricities'] = {
+            v: (int(ecc[graph.index[v]]) if ecc[graph.index[v]] >= 0 else float('inf'))
+            for v in graph.vertices}
+        self.values['diameter'] = (float('inf') if (ecc < 0).any()
+                                   else int(ecc.max()) if len(ecc) else 0)
+
+    def _compute_eccentricities(self, workers=None):
+        csr = self.graph.csr
+        if choose_method(csr) == 'bitparallel':
+            self._store_eccentricities(bitparallel_eccentricities(csr))
+        else:
+            self._store_eccentricities(eccentricities(csr, workers))
+
+    def _compute_diameter(self):
+        csr = self.graph.csr
+        if not self.values.get('is_connected', True):  # несвязность уже известна - без BFS
+            self.values['diameter'] = float('inf')
+        else:
+            self.values['diameter'] = ifub_diameter(csr)
+
+
+class InvariantsMixin:
+    """Методы инвариантов поверх self.invariants (InvariantCache) и self.csr -
+    общие для Graph, GraphView и неявных графов, чтобы набор инвариантов был один"""
+
+    def get_degrees(self):
+        return self.invariants.get('degrees')
+
+    def get_degree_sequence(self):
+        return self.invariants.get('degree_sequence')
+
+    def is_connected(self):
+        return self.invariants.get('is_connected')
+
+    def count_components(self):
+        return self.invariants.get('num_components')
+
+    def get_connected_components(self):
+        return self.invariants.get('components')
+
+    def get_diameter(self):
+        """Диаметр через iFUB; для несвязного графа берётся уже известная связность"""
+        return self.invariants.get('diameter')
+
+    def num_edges(self):
+        return int(self.csr.degrees().sum()) // 2
+
+    def get_graph_invariants(self):
+        degrees = self.get_degrees()
+        return {
+            'num_vertices': len(self.vertices),
+            'num_edges': self.num_edges(),
+            'degree_sequence': self.get_degree_sequence(),
+            'max_degree': max(degrees.values()),
+            'min_degree': min(degrees.values()),
+            'is_connected': self.is_connected(),
+            'num_components': self.count_components(),
+            'diameter': self.get_diameter(),
+            'degrees': degrees
+        }
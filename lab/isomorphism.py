@@ -0,0 +1,152 @@
+"""Изоморфизм графов: уточнение раскраски (Вейсфейлер-Леман) как быстрый отсев
+и поиск с индивидуализацией вершин для точного ответа и канонической формы.
+
+Графы - объекты с csr и order (Graph, GraphView): вершина с номером i - order[i]."""
+import hashlib
+from collections import Counter
+
+
+def adjacency(graph):
+    """Списки соседей по номерам CSR"""
+    csr = graph.csr
+    return [csr.neighbors_of(i).tolist() for i in range(csr.n)]
+
+
+def refine(adj, colors):
+    """Уточнение раскраски до устойчивой. Новый цвет - ранг подписи
+    (цвет, отсортированные цвета соседей) среди всех подписей, поэтому раскраска
+    не зависит от нумерации. Возвращает цвета и след - по раунду на каждый
+    шаг (подписи с их числом); у изоморфных графов следы совпадают"""
+    trace = []
+    n_colors = len(set(colors))
+    while True:
+        signatures = [(colors[v], tuple(sorted(colors[u] for u in adj[v]))) for v in range(len(adj))]
+        counts = sorted(Counter(signatures).items())
+        rank = {signature: i for i, (signature, _) in enumerate(counts)}
+        colors = [rank[signature] for signature in signatures]
+        trace.append(tuple(counts))
+        if len(counts) == n_colors:
+            return colors, tuple(trace)
+        n_colors = len(counts)
+
+
+def individualize(colors, v):
+    """Вершина v получает собственный новый цвет"""
+    colors = list(colors)
+    colors[v] = max(colors) + 1
+    return colors
+
+
+def _target_cell(colors):
+    """Наименьший неодноэлементный класс (при равенстве - с меньшим цветом)"""
+    sizes = Counter(colors)
+    cells = [(size, color) for color, size in sizes.items() if size > 1]
+    if not cells:
+        return None
+    return min(cells)[1]
+
+
+def _edge_multiset(adj, labels):
+    return sorted((min(labels[v], labels[u]), max(labels[v], labels[u]))
+                  for v in range(len(adj)) for u in adj[v] if v <= u)
+
+
+def wl_colors(graph):
+    """Устойчивая раскраска графа и её след"""
+    adj = adjacency(graph)
+    return refine(adj, [0] * len(adj))
+
+
+def wl_equivalent(g1, g2):
+    """Быстрый отсев: False - графы точно не изоморфны"""
+    return wl_colors(g1)[1] == wl_colors(g2)[1]
+
+
+def _orbit_finder(automorphisms, fixed, n):
+    """Орбиты подгруппы, порождённой найденными автоморфизмами, fixed оставляющими на месте"""
+    parent = list(range(n))
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for gamma in automorphisms:
+        if all(gamma[v] == v for v in fixed):
+            for v in range(n):
+                a, b = find(v), find(gamma[v])
+                if a != b:
+                    parent[a] = b
+    return find
+
+
+def canonical_labeling(graph):
+    """Каноническая нумерация: вершина -> позиция, и сертификат (n, рёбра в новых номерах).
+    У изоморфных графов сертификаты равны. Обход дерева индивидуализаций:
+    ветки со следом хуже лучшего отсекаются, а равные листья дают автоморфизмы,
+    по орбитам которых не повторяются симметричные ветки"""
+    adj = adjacency(graph)
+    n = len(adj)
+    colors, trace = refine(adj, [0] * n)
+    best = {'path': None, 'cert': None, 'labels': None}
+    automorphisms = []
+
+    def visit(colors, path, fixed):
+        known = best['path']
+        if known is not None:
+            prefix = known[:len(path)]
+            if path > prefix:
+                return
+            if path < prefix:  # новая ветка лучше - прежний лист недействителен
+                best.update(path=None, cert=None, labels=None)
+        cell = _target_cell(colors)
+        if cell is None:
+            cert = _edge_multiset(adj, colors)
+            if best['path'] is None or (path, cert) < (best['path'], best['cert']):
+                best.update(path=path, cert=cert, labels=colors)
+            elif (path, cert) == (best['path'], best['cert']):
+                inverse = {label: w for w, label in enumerate(best['labels'])}
+                automorphisms.append([inverse[label] for label in colors])
+            return
+        tried = []
+        for v in (v for v, color in enumerate(colors) if color == cell):
+            find = _orbit_finder(automorphisms, fixed, n)
+            if any(find(v) == find(u) for u in tried):
+                continue
+            tried.append(v)
+            refined, step = refine(adj, individualize(colors, v))
+            visit(refined, path + (step,), fixed + (v,))
+
+    visit(colors, (trace,), ())
+    labels = best['labels'] or []
+    certificate = (n, tuple(best['cert'] or ()))
+    return {graph.order[v]: label for v, label in enumerate(labels)}, certificate
+
+
+def find_isomorphism(g1, g2):
+    """Изоморфизм g1 -> g2 в виде словаря вершин или None.
+    Сначала дешёвые проверки и след уточнения, затем сравнение канонических форм:
+    вершины с одинаковой канонической позицией соответствуют друг другу"""
+    adj1, adj2 = adjacency(g1), adjacency(g2)
+    if len(adj1) != len(adj2) or sum(map(len, adj1)) != sum(map(len, adj2)):
+        return None
+    if refine(adj1, [0] * len(adj1))[1] != refine(adj2, [0] * len(adj2))[1]:
+        return None
+    labels1, cert1 = canonical_labeling(g1)
+    labels2, cert2 = canonical_labeling(g2)
+    if cert1 != cert2:
+        return None
+    inverse = {label: w for w, label in labels2.items()}
+    return {v: inverse[label] for v, label in labels1.items()}
+
+
+def canonical_hash(graph):
+    """Хэш канонической формы: равен у изоморфных графов"""
+    _, certificate = canonical_labeling(graph)
+    return hashlib.sha1(repr(certificate).encode()).hexdigest()
+
+
+def refinement_hash(graph):
+    """Хэш следа уточнения раскраски: дешёвый инвариант для индексов графов"""
+    return hashlib.sha1(repr(wl_colors(graph)[1]).encode()).hexdigest()
@@ -1,6 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import itertools
+from bitrel import BitRelation
+from properties import relation_properties
+from closure import transitive_closure, reflexive_closure, symmetric_closure
+from compose import compose
+from relation import Relation
+from product_set import ProductSet
 
 n1 = [0, 4, 7]
 n2 = [1, 5, 0, 7]
@@ -11,20 +16,20 @@ print("N1 =", N1)
 print("N2 =", N2)
 print()
 
-N1_x_N2 = set(itertools.product(N1, N2))
-N2_x_N1 = set(itertools.product(N2, N1))
-print("N1 x N2 =", N1_x_N2)
-print("N2 x N1 =", N2_x_N1)
+N1_x_N2 = ProductSet.of(N1, N2)  # пары не строятся, хранятся только сомножители
+N2_x_N1 = ProductSet.of(N2, N1)
+print("N1 x N2 =", N1_x_N2.to_set())
+print("N2 x N1 =", N2_x_N1.to_set())
 print()
 
 result1 = N1_x_N2.symmetric_difference(N2_x_N1)  # (N1 x N2) ⇔ (N2 x N1)
 result2 = N1_x_N2.union(N2_x_N1)                # (N1 x N2) ∪ (N2 x N1)
-result3 = set(itertools.product(N1.symmetric_difference(N2), repeat=2))  # (N1 ⇔ N2) x (N1 ⇔ N2)
-result4 = set(itertools.product(N1.union(N2), repeat=2))                 # (N1 ∪ N2) x (N1 ∪ N2)
-print("(N1 x N2) ⇔ (N2 x N1) =", result1)
-print("(N1 x N2) ∪ (N2 x N1) =", result2)
-print("(N1 ⇔ N2) x (N1 ⇔ N2) =", result3)
-print("(N1 ∪ N2) x (N1 ∪ N2) =", result4)
+result3 = ProductSet.square(N1.symmetric_difference(N2))  # (N1 ⇔ N2) x (N1 ⇔ N2)
+result4 = ProductSet.square(N1.union(N2))                 # (N1 ∪ N2) x (N1 ∪ N2)
+print("(N1 x N2) ⇔ (N2 x N1) =", result1.to_set())
+print("(N1 x N2) ∪ (N2 x N1) =", result2.to_set())
+print("(N1 ⇔ N2) x (N1 ⇔ N2) =", result3.to_set())
+print("(N1 ∪ N2) x (N1 ∪ N2) =", result4.to_set())
 print()
 def plot_set(ax, set_data, title, color='blue'):
     if not set_data:
@@ -55,23 +60,21 @@ while True: # проверка на ввод мощности мн-ва
     except ValueError:
         print("Ошибка: введите целое число!")
 X = list(range(1, n + 1))
-R = [(x, y) for x in X for y in X if x % 2 == 1 and y % 2 == 1]
-Q = [(x, y) for x in X for y in X if x <= y and y % 2 == 0]
+R = Relation.product(X, lambda x: x % 2 == 1, lambda y: y % 2 == 1)
+Q = Relation(X, lambda x, y: x <= y and y % 2 == 0,
+             vectorized=lambda x, y: (x <= y) & (y % 2 == 0))
 print("\nОтношение R (x нечётно, y нечётно):")
-print(R)
+print(list(R))
 print("\nОтношение Q (x ≤ y, y чётно):")
-print(Q)
+print(list(Q))
 
-RoQ = []
-for (x, z) in R:
-    for (a, y) in Q:
-        if z == a:
-            RoQ.append((x, y))
-RoQ = list(set(RoQ))  # убираем дубликаты
+RoQ = compose(R, Q, n)  # каждая пара - один раз, без дубликатов
 print("\nКомпозиция RoQ:")
 print(RoQ)
 
 def relation_matrix(rel, n):
+    if isinstance(rel, Relation) and rel.universe == list(range(1, n + 1)):
+        return rel.to_matrix()
     mat = np.zeros((n, n), dtype=int)
     for (x, y) in rel:
         if 1 <= x <= n and 1 <= y <= n:
@@ -88,6 +91,8 @@ print("\nМатрица отношения RoQ:")
 print(MRoQ)
 
 def domain_and_range(rel):
+    if isinstance(rel, Relation):
+        return rel.domain(), rel.range()
     domain = set(x for (x, y) in rel)
     range_set = set(y for (x, y) in rel)
     return domain, range_set
@@ -99,31 +104,10 @@ print("Область определения Q:", dom_Q)
 print("Область значений Q:", ran_Q)
 
 def check_properties(rel, n):
-    X = set(range(1, n + 1))
+    if isinstance(rel, BitRelation):
+        return relation_properties(rel)
     matrix = relation_matrix(rel, n)
-    reflexive = all(matrix[i, i] == 1 for i in range(n)) # рефлексивность
-    irreflexive = all(matrix[i, i] == 0 for i in range(n)) # антирефлексивность
-    symmetric = np.array_equal(matrix, matrix.T) # симметричность
-    antisymmetric = True 
-    for i in range(n):
-        for j in range(n):
-            if i != j and matrix[i, j] == 1 and matrix[j, i] == 1:
-                antisymmetric = False
-                break
-    transitive = True
-    M_sq = np.dot(matrix, matrix)
-    for i in range(n):
-        for j in range(n):
-            if M_sq[i, j] >= 1 and matrix[i, j] == 0:
-                transitive = False
-                break
-    return {
-        'рефлексивное': reflexive,
-        'антирефлексивное': irreflexive,
-        'симметричное': symmetric,
-        'антисимметричное': antisymmetric,
-        'транзитивное': transitive
-    }
+    return relation_properties(matrix)
 props_R = check_properties(R, n)
 props_Q = check_properties(Q, n)
 print("\nСвойства отношения R:")
@@ -135,21 +119,7 @@ for prop, value in props_Q.items():
 
 
 def warshal_closure(matrix): # алгоритм Уоршелла - для нечётных вариантов
-    n = len(matrix)
-    closure = matrix.copy()
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                closure[i, j] = closure[i, j] or (closure[i, k] and closure[k, j])
-    return closure
-def reflexive_closure(matrix): # рефлексивное замыкание
-    n = len(matrix)
-    closure = matrix.copy()
-    for i in range(n):
-        closure[i, i] = 1
-    return closure
-def symmetric_closure(matrix): # симметричное замыкание
-    return np.logical_or(matrix, matrix.T).astype(int)
+    return transitive_closure(matrix)
 print("РАБОТА С ЗАМЫКАНИЯМИ")
 
 while True:
@@ -183,7 +153,7 @@ while True:
         matrix = MQ
         relation = Q
     print(f"\nИсходное отношение {rel_name}:")
-    print(relation)
+    print(list(relation))
     print(f"Матрица отношения {rel_name}:")
     print(matrix)
     if choice_closure == '1':
@@ -1,16 +1,139 @@
 import numpy as np
-from collections import deque, defaultdict
 import matplotlib.pyplot as plt
-import networkx as nx
+from csr import CSR
+from edge_store import EdgeStore, canonical
+from edge_io import load_edge_list, load_binary
+from invariants import InvariantCache, InvariantsMixin
+from graph_view import GraphView
+from union_find import DisjointSet
+from render import LayoutCache, figure
+from implicit import ComplementGraph, JoinGraph
+import graph_algebra
+from isomorphism import find_isomorphism
 
-class Graph:
+class Graph(InvariantsMixin):
     def __init__(self, vertices, edges, name="Graph"):
-        self.vertices = vertices
-        self.edges = edges
+        self._vertices = list(vertices)  # свои копии: add_vertex / add_edge дописывают в них
+        self._edges = list(edges)
         self.name = name
-        self.n = len(vertices)
-        self.adj_list = self._build_adj_list()
-        self.adj_matrix = self._build_adj_matrix()
+        self.version = 0
+        self.invariants = InvariantCache(self)  # степени, компоненты, диаметр - один раз на версию
+        self.layout_cache = LayoutCache()  # положения вершин, общие с производными графами
+        self._rebuild()
+    
+    @classmethod
+    def from_csr(cls, csr, vertices, name="Graph"):
+        """Граф поверх готового CSR: номер i - вершина vertices[i] (по возрастанию).
+        Список рёбер и их множество строятся только при обращении"""
+        graph = cls.__new__(cls)
+        graph._vertices = list(vertices)
+        graph._edges = None
+        graph.name = name
+        graph.version = 0
+        graph.invariants = InvariantCache(graph)
+        graph.layout_cache = LayoutCache()
+        graph._rebuild(csr)
+        return graph
+    
+    @classmethod
+    def load(cls, path, dtype=None, count_first=False, name=None):
+        """Граф из файла рёбер: текстового или (dtype=np.int32/np.int64) бинарного"""
+        if dtype is None:
+            csr, labels = load_edge_list(path, count_first)
+        else:
+            csr, labels = load_binary(path, dtype, count_first)
+        return cls.from_csr(csr, labels.tolist(), path if name is None else name)
+    
+    @property
+    def vertices(self):
+        return self._vertices
+    
+    @vertices.setter
+    def vertices(self, vertices):
+        self._vertices = list(vertices)
+        self._rebuild()
+    
+    @property
+    def edges(self):
+        if self._edges is None:  # граф из CSR - рёбра в первый раз собираются из массивов
+            src, dst = self.edge_ends
+            order = self.order
+            self._edges = [(order[a], order[b]) for a, b in zip(src.tolist(), dst.tolist())]
+        return self._edges
+    
+    @edges.setter
+    def edges(self, edges):
+        self._edges = list(edges)
+        self._rebuild()
+    
+    @property
+    def edge_store(self):
+        if self._edge_store is None:
+            self._edge_store = EdgeStore(self.edges)
+        return self._edge_store
+    
+    @property
+    def edge_ends(self):
+        """Концы рёбер в номерах CSR, нужны видам GraphView"""
+        if self._edge_ends is None:
+            self._edge_ends = self._ends_from_csr()
+        return self._edge_ends
+    
+    @property
+    def csr(self):
+        if self._csr is None:
+            self._csr = self._build_csr()
+        return self._csr
+    
+    @property
+    def disjoint_set(self):
+        """Компоненты связности как система непересекающихся множеств вершин;
+        строится один раз и дальше поддерживается при добавлении рёбер"""
+        if self._disjoint_set is None:
+            labels, count = self.csr.components()
+            self._disjoint_set = DisjointSet.from_labels(self.order, labels)
+        return self._disjoint_set
+    
+    def _rebuild(self, csr=None):
+        """Пересборка структур после замены вершин или рёбер; новая версия сбрасывает кэш инвариантов"""
+        self.n = len(self.vertices)
+        self.order = sorted(self.vertices)  # номер вершины в CSR и в матрице смежности
+        self.index = {v: i for i, v in enumerate(self.order)}
+        self._edge_store = None
+        self._edge_ends = None
+        self._csr = csr  # None - CSR соберётся при первом обращении
+        self._disjoint_set = None
+        self._adj_list = None
+        self._adj_matrix = None
+        self.version += 1
+    
+    def _build_csr(self):
+        src = np.fromiter((self.index[u] for u, v in self.edges), dtype=np.int64, count=len(self.edges))
+        dst = np.fromiter((self.index[v] for u, v in self.edges), dtype=np.int64, count=len(self.edges))
+        self._edge_ends = (src, dst)
+        return CSR.from_edges(self.n, src, dst)
+    
+    def _ends_from_csr(self):
+        """Каждое ребро CSR один раз: пары i < j и половина записей петель"""
+        rows = np.repeat(np.arange(self.n), self.csr.degrees())
+        cols = self.csr.neighbors
+        loops = np.flatnonzero(rows == cols)[::2]  # петля записана в строке дважды
+        keep = np.sort(np.concatenate([np.flatnonzero(rows < cols), loops]))
+        return rows[keep], cols[keep]
+    
+    @property
+    def adj_list(self):
+        """Списки смежности строятся только при обращении"""
+        if self._adj_list is None:
+            self._adj_list = self._build_adj_list()
+        return self._adj_list
+    
+    @property
+    def adj_matrix(self):
+        """Плотная матрица смежности строится только при обращении"""
+        if self._adj_matrix is None:
+            self._adj_matrix = self._build_adj_matrix()
+        return self._adj_matrix
     
     def _build_adj_list(self):
         adj_list = {v: [] for v in self.vertices}
@@ -20,117 +143,47 @@ class Graph:
         return adj_list
     
     def _build_adj_matrix(self):
-        matrix = np.zeros((self.n, self.n), dtype=int)
-        vertex_to_index = {v: i for i, v in enumerate(sorted(self.vertices))}
-        
-        for u, v in self.edges:
-            i, j = vertex_to_index[u], vertex_to_index[v]
-            matrix[i][j] = 1
-            matrix[j][i] = 1
-        return matrix
+        return self.csr.to_dense()
+    
+    def adjacency(self, sparse=False):
+        """Матрица смежности; sparse=True - разреженная scipy-матрица"""
+        if sparse:
+            return self.csr.to_sparse()
+        return self.adj_matrix
     
-    def get_degrees(self):
-        degrees = {}
-        for v in self.vertices:
-            degrees[v] = len(self.adj_list[v])
-        return degrees
+    def has_edge(self, u, v):
+        return (u, v) in self.edge_store
     
-    def get_degree_sequence(self):
-        degrees = self.get_degrees()
-        return sorted(degrees.values(), reverse=True)
+    def neighbors(self, v):
+        return [self.order[i] for i in self.csr.neighbors_of(self.index[v])]
     
     def is_connected(self):
-        if not self.vertices:
-            return True
-        
-        visited = set()
-        stack = [self.vertices[0]]
-        
-        while stack:
-            vertex = stack.pop()
-            if vertex not in visited:
-                visited.add(vertex)
-                stack.extend(self.adj_list[vertex])
-        
-        return len(visited) == len(self.vertices)
+        return self.disjoint_set.count <= 1
     
-    def get_connected_components(self):
-        visited = set()
-        components = []
-        
-        for vertex in self.vertices:
-            if vertex not in visited:
-                component = []
-                stack = [vertex]
-                
-                while stack:
-                    v = stack.pop()
-                    if v not in visited:
-                        visited.add(v)
-                        component.append(v)
-                        stack.extend(self.adj_list[v])
-                
-                components.append(component)
-        
-        return components
+    def connected(self, u, v):
+        """Лежат ли u и v в одной компоненте связности"""
+        return self.disjoint_set.connected(u, v)
     
-    def get_diameter(self):
-        if not self.is_connected():
-            return float('inf')
-        
-        diameter = 0
-        for start in self.vertices:
-            distances = {}
-            queue = deque([start])
-            distances[start] = 0
-            
-            while queue:
-                current = queue.popleft()
-                for neighbor in self.adj_list[current]:
-                    if neighbor not in distances:
-                        distances[neighbor] = distances[current] + 1
-                        queue.append(neighbor)
-            
-            diameter = max(diameter, max(distances.values()))
-        
-        return diameter
+    def count_components(self):
+        return self.disjoint_set.count
     
-    def get_graph_invariants(self):
-        degrees = self.get_degrees()
-        degree_sequence = self.get_degree_sequence()
-        components = self.get_connected_components()
-        
-        return {
-            'num_vertices': len(self.vertices),
-            'num_edges': len(self.edges),
-            'degree_sequence': degree_sequence,
-            'max_degree': max(degrees.values()),
-            'min_degree': min(degrees.values()),
-            'is_connected': self.is_connected(),
-            'num_components': len(components),
-            'diameter': self.get_diameter(),
-            'degrees': degrees
-        }
+    def get_eccentricities(self, workers=None):
+        """Эксцентриситеты всех вершин, BFS раздаются пулу процессов"""
+        return self.invariants.get('eccentricities', workers=workers)
 
-    def draw(self, save_path=None):
-        """Визуализация графа"""
-        G = nx.Graph()
-        G.add_nodes_from(self.vertices)
-        G.add_edges_from(self.edges)
-        
-        plt.figure(figsize=(8, 6))
-        pos = nx.spring_layout(G, seed=42)
-        nx.draw(G, pos, with_labels=True, node_color='lightblue', 
-                node_size=800, font_size=12, font_weight='bold', 
-                edge_color='gray', linewidths=1, alpha=0.7)
-        plt.title(f'Граф {self.name}')
-        plt.axis('off')
-        plt.tight_layout()
+    def draw(self, save_path=None, show=True):
+        """Визуализация графа; положения вершин берутся из общей с исходным графом раскладки.
+        show=False - без окна (для записи в файл без дисплея)"""
+        pos = self.layout_cache.layout(self.vertices, self.edges)
+        fig = figure(self.vertices, self.edges, pos, self.name)
         
         if save_path:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
             print(f"Граф сохранен как {save_path}")
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
 
     def display_info(self):
         """Отображение информации о графе"""
@@ -142,16 +195,67 @@ class Graph:
         print(f"Степени вершин: {self.get_degrees()}")
 
     # ОПЕРАЦИИ НАД ГРАФАМИ
+    def view(self):
+        """Лёгкий вид графа: цепочки удалений и стягиваний без перестроения"""
+        return GraphView(self)
+    
+    def _derive(self, vertices, edges, name, other=None, components=None):
+        """Граф-результат операции: раскладка общая с исходным, вершины other добавляются в неё;
+        components - уже известные компоненты результата (DisjointSet)"""
+        result = Graph(vertices, edges, name)
+        result.layout_cache = self.layout_cache
+        result._disjoint_set = components
+        if other is not None:
+            self.layout_cache.merge(other.layout_cache)
+        return result
+    
+    # ИЗМЕНЕНИЕ НА МЕСТЕ - компоненты не пересчитываются, а поддерживаются
+    def add_vertex(self, vertex):
+        """Добавление изолированной вершины"""
+        if vertex in self.index:
+            return
+        components = self._disjoint_set
+        self._vertices.append(vertex)
+        self._rebuild()
+        if components is not None:
+            components.add(vertex)
+            self._disjoint_set = components
+    
+    def add_edge(self, edge):
+        """Добавление ребра: CSR и кэши сбрасываются, компоненты сливаются за O(alpha(n))"""
+        self.add_edges([edge])
+    
+    def add_edges(self, edges):
+        edges = list(edges)
+        for u, v in edges:
+            if u not in self.index or v not in self.index:
+                raise ValueError(f"вершин {u} и {v} должны быть в графе {self.name}")
+        self.edges.extend(edges)
+        for u, v in edges:
+            if self._edge_store is not None:
+                self._edge_store.add((u, v))
+            if self._disjoint_set is not None:
+                self._disjoint_set.union(u, v)
+        self._csr = None
+        self._edge_ends = None
+        self._adj_list = None
+        self._adj_matrix = None
+        self.version += 1
+    
     def remove_edge(self, edge):
         """Удаление ребра"""
-        new_edges = [e for e in self.edges if e != edge and (e[1], e[0]) != edge]
-        return Graph(self.vertices, new_edges, f"{self.name} без ребра {edge}")
+        if edge not in self.edge_store:
+            new_edges = list(self.edges)
+        else:
+            key = canonical(edge)
+            new_edges = [e for e in self.edges if canonical(e) != key]
+        return self._derive(self.vertices, new_edges, f"{self.name} без ребра {edge}")
     
     def remove_vertex(self, vertex):
         """Удаление вершины"""
         new_vertices = [v for v in self.vertices if v != vertex]
         new_edges = [e for e in self.edges if e[0] != vertex and e[1] != vertex]
-        return Graph(new_vertices, new_edges, f"{self.name} без вершины {vertex}")
+        return self._derive(new_vertices, new_edges, f"{self.name} без вершины {vertex}")
     
     def identify_vertices(self, u, v):
         """Отождествление вершин"""
@@ -163,6 +267,7 @@ class Graph:
             new_vertices.append(new_vertex)
         
         new_edges = []
+        seen = set()
         for edge in self.edges:
             a, b = edge
             if a == remaining_vertex:
@@ -171,33 +276,56 @@ class Graph:
                 b = new_vertex
             if a != b:
                 new_edge = (min(a, b), max(a, b))
-                if new_edge not in new_edges:
+                if new_edge not in seen:
+                    seen.add(new_edge)
                     new_edges.append(new_edge)
         
-        return Graph(new_vertices, new_edges, f"{self.name} с отождествлением {u} и {v}")
+        components = None
+        if self._disjoint_set is not None and u in self.index and v in self.index:
+            # компоненты те же, только u и v слились; удалённой вершины в новых множествах нет
+            merged = self._disjoint_set.copy()
+            merged.union(u, v)
+            components = DisjointSet.from_labels(new_vertices, [merged.find(x) for x in new_vertices])
+        return self._derive(new_vertices, new_edges, f"{self.name} с отождествлением {u} и {v}",
+                            components=components)
     
     def contract_edge(self, edge):
         """Стягивание ребра"""
         return self.identify_vertices(edge[0], edge[1])
     
-    def complement(self):
-        """Дополнение графа"""
+    def complement(self, implicit=False):
+        """Дополнение графа; implicit=True - неявный граф без построения рёбер"""
+        if implicit:
+            return ComplementGraph(self)
         all_possible_edges = []
         for i in range(len(self.vertices)):
             for j in range(i + 1, len(self.vertices)):
                 all_possible_edges.append((self.vertices[i], self.vertices[j]))
         
-        complement_edges = [e for e in all_possible_edges if e not in self.edges and (e[1], e[0]) not in self.edges]
-        return Graph(self.vertices, complement_edges, f"Дополнение {self.name}")
+        complement_edges = [e for e in all_possible_edges if e not in self.edge_store]
+        return self._derive(self.vertices, complement_edges, f"Дополнение {self.name}")
     
-    def union(self, other):
-        """Объединение графов"""
+    def union(self, other, matrix=False):
+        """Объединение графов; matrix=True - OR битовых матриц смежности (MatrixGraph)"""
+        if matrix:
+            return graph_algebra.apply('union', self, other)
         union_vertices = list(set(self.vertices + other.vertices))
-        union_edges = list(set(self.edges + other.edges))
-        return Graph(union_vertices, union_edges, f"Объединение {self.name} и {other.name}")
+        union_store = EdgeStore()
+        union_edges = []
+        for edge in self.edges + other.edges:  # ребро и его обращение - одно ребро
+            if edge not in union_store:
+                union_store.add(edge)
+                union_edges.append(edge)
+        components = None
+        if self._disjoint_set is not None and other._disjoint_set is not None:
+            components = self._disjoint_set.copy().merge(other._disjoint_set)
+        return self._derive(union_vertices, union_edges, f"Объединение {self.name} и {other.name}", other,
+                            components)
     
-    def join(self, other):
-        """Соединение графов"""
+    def join(self, other, implicit=False):
+        """Соединение графов; implicit=True - неявный граф без построения |V1|*|V2| рёбер"""
+        if implicit:
+            return JoinGraph(self, other)
         join_vertices = list(set(self.vertices + other.vertices))
         join_edges = self.edges + other.edges
         
@@ -206,31 +334,37 @@ class Graph:
                 join_edges.append((u, v))
         
         join_edges = list(set(join_edges))
-        return Graph(join_vertices, join_edges, f"Соединение {self.name} и {other.name}")
+        if self.vertices and other.vertices:  # перекрёстные рёбра связывают всё
+            components = DisjointSet.from_labels(join_vertices, [0] * len(join_vertices))
+        else:
+            components = (self if self.vertices else other)._disjoint_set
+            components = components.copy() if components is not None else None  # add_edge меняет его на месте
+        return self._derive(join_vertices, join_edges, f"Соединение {self.name} и {other.name}", other,
+                            components)
     
-    def intersection(self, other):
-        """Пересечение графов"""
+    def intersection(self, other, matrix=False):
+        """Пересечение графов; matrix=True - AND битовых матриц смежности (MatrixGraph)"""
+        if matrix:
+            return graph_algebra.apply('intersection', self, other)
         intersection_vertices = list(set(self.vertices) & set(other.vertices))
         intersection_edges = []
         
         for edge in self.edges:
-            if edge in other.edges or (edge[1], edge[0]) in other.edges:
+            if edge in other.edge_store:
                 intersection_edges.append(edge)
         
-        return Graph(intersection_vertices, intersection_edges, f"Пересечение {self.name} и {other.name}")
+        return self._derive(intersection_vertices, intersection_edges, f"Пересечение {self.name} и {other.name}", other)
     
-    def ring_sum(self, other):
-        """Кольцевая сумма (симметрическая разность)"""
+    def ring_sum(self, other, matrix=False):
+        """Кольцевая сумма (симметрическая разность); matrix=True - XOR битовых матриц (MatrixGraph)"""
+        if matrix:
+            return graph_algebra.apply('ring_sum', self, other)
         ring_vertices = list(set(self.vertices + other.vertices))
         
-        edges1 = set(self.edges)
-        edges2 = set(other.edges)
-        
-        edges1_sym = edges1 | set((v, u) for (u, v) in edges1)
-        edges2_sym = edges2 | set((v, u) for (u, v) in edges2)
-        
-        ring_edges = list((edges1_sym ^ edges2_sym) & set(self.edges + other.edges))
-        return Graph(ring_vertices, ring_edges, f"Кольцевая сумма {self.name} и {other.name}")
+        # ребро входит, если оно есть ровно в одном из графов (в любой ориентации)
+        ring_edges = list(set(e for e in self.edges + other.edges
+                              if (e in self.edge_store) != (e in other.edge_store)))
+        return self._derive(ring_vertices, ring_edges, f"Кольцевая сумма {self.name} и {other.name}", other)
 
 def check_isomorphism(G1, G2):
     print("=" * 60)
@@ -277,6 +411,15 @@ def check_isomorphism(G1, G2):
         status = "✓ СОВПАДАЕТ" if match else "✗ НЕ СОВПАДАЕТ"
         print(f"  {name}: {val1} vs {val2} - {status}")
     
+    # Инварианты совпали - точная проверка: отсев уточнением раскраски и поиск отображения
+    if isomorphic:
+        mapping = find_isomorphism(G1, G2)
+        isomorphic = mapping is not None
+        if isomorphic:
+            print(f"\nИЗОМОРФИЗМ G1 -> G2: {mapping}")
+        else:
+            print("\nИнварианты совпадают, но отображения, сохраняющего рёбра, нет")
+    
     print(f"\nРЕЗУЛЬТАТ: ГРАФЫ {'ИЗОМОРФНЫ' if isomorphic else 'НЕ ИЗОМОРФНЫ'}")
     
     return isomorphic
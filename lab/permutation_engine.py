@@ -0,0 +1,48 @@
+"""Перестановки на месте алгоритмом Хипа: следующая перестановка отличается от предыдущей
+одним обменом двух позиций общего буфера, поэтому ни списков, ни копий не нужно.
+
+    for p in heap_permutations(items, copy=False): ...  # p - сам буфер, его не хранить
+    visit_permutations(items, visit)  # visit(buffer, i, j): i, j - обменянные позиции
+
+Передача обменянных позиций позволяет пересчитывать оценку (например, длину маршрута)
+по изменившимся местам, а не заново по всей перестановке.
+"""
+
+
+def _heap_swaps(n):
+    """Пары позиций (i, j), обмен которых по очереди даёт все перестановки (порядок Хипа)"""
+    c = [0] * n
+    i = 1
+    while i < n:
+        if c[i] < i:
+            yield (0, i) if i % 2 == 0 else (c[i], i)
+            c[i] += 1
+            i = 1
+        else:
+            c[i] = 0
+            i += 1
+
+
+def heap_permutations(elements: list, copy: bool = True):
+    """Все перестановки elements в порядке Хипа. copy=False - каждый раз отдаётся
+    один и тот же список-буфер (без выделения памяти на перестановку)"""
+    buffer = list(elements)
+    yield tuple(buffer) if copy else buffer
+    for i, j in _heap_swaps(len(buffer)):
+        buffer[i], buffer[j] = buffer[j], buffer[i]
+        yield tuple(buffer) if copy else buffer
+
+
+def visit_permutations(elements: list, visit) -> int:
+    """Вызов visit(buffer, i, j) для каждой перестановки; для первой i = j = None.
+    Если visit вернул True, перебор останавливается. Возвращает число посещённых перестановок"""
+    buffer = list(elements)
+    count = 1
+    if visit(buffer, None, None):
+        return count
+    for i, j in _heap_swaps(len(buffer)):
+        buffer[i], buffer[j] = buffer[j], buffer[i]
+        count += 1
+        if visit(buffer, i, j):
+            break
+    return count
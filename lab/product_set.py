@@ -0,0 +1,75 @@
+import itertools
+
+
+class ProductSet:
+    """Множество пар как объединение попарно непересекающихся прямоугольников A × B.
+    Хранятся только множества-сомножители, пары перечисляются по требованию"""
+
+    def __init__(self, rectangles=()):
+        self.rectangles = [(frozenset(a), frozenset(b)) for a, b in rectangles if a and b]
+
+    @classmethod
+    def of(cls, a, b):
+        """Декартово произведение a × b"""
+        return cls([(a, b)])
+
+    @classmethod
+    def square(cls, a):
+        return cls([(a, a)])
+
+    def __len__(self):
+        return sum(len(a) * len(b) for a, b in self.rectangles)
+
+    def __bool__(self):
+        return bool(self.rectangles)
+
+    def __contains__(self, pair):
+        x, y = pair
+        return any(x in a and y in b for a, b in self.rectangles)
+
+    def __iter__(self):
+        for a, b in self.rectangles:
+            yield from itertools.product(a, b)
+
+    def to_set(self):
+        return set(self)
+
+    @staticmethod
+    def _subtract(rect, other):
+        """rect \\ other - не более двух непересекающихся прямоугольников"""
+        (a1, b1), (a2, b2) = rect, other
+        common = a1 & a2
+        if not common or not (b1 & b2):
+            return [rect]
+        return [(a1 - a2, b1), (common, b1 - b2)]
+
+    def intersection(self, other):
+        return ProductSet((a1 & a2, b1 & b2)
+                          for a1, b1 in self.rectangles for a2, b2 in other.rectangles)
+
+    def difference(self, other):
+        pieces = self.rectangles
+        for rect in other.rectangles:
+            pieces = [part for piece in pieces for part in self._subtract(piece, rect)
+                      if part[0] and part[1]]
+        return ProductSet(pieces)
+
+    def union(self, other):
+        return ProductSet(self.rectangles + other.difference(self).rectangles)
+
+    def symmetric_difference(self, other):
+        return ProductSet(self.difference(other).rectangles + other.difference(self).rectangles)
+
+    __and__ = intersection
+    __sub__ = difference
+    __or__ = union
+    __xor__ = symmetric_difference
+
+    def __eq__(self, other):
+        if not isinstance(other, ProductSet):
+            return NotImplemented
+        return len(self) == len(other) and not self.difference(other)
+
+    def __repr__(self):
+        parts = " ∪ ".join(f"{sorted(a)} x {sorted(b)}" for a, b in self.rectangles)
+        return f"ProductSet({parts or '∅'})"
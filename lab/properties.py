@@ -0,0 +1,92 @@
+import numpy as np
+from bitrel import BLOCK_ELEMS, BitRelation
+
+FIRST_BLOCK = 64  # первые блоки маленькие, чтобы контрпример находился быстро
+
+
+def _row_blocks(n, block_rows=None):
+    """Полосы строк [r0, r1); без block_rows размер удваивается до предела BLOCK_ELEMS"""
+    limit = block_rows or max(1, BLOCK_ELEMS // max(n, 1))
+    size = block_rows or min(FIRST_BLOCK, limit)
+    r0 = 0
+    while r0 < n:
+        r1 = min(n, r0 + size)
+        yield r0, r1
+        r0 = r1
+        size = min(2 * size, limit)
+
+
+def is_reflexive(matrix):
+    if isinstance(matrix, BitRelation):
+        return bool(matrix.diagonal().all())
+    return bool(np.diagonal(matrix).all())
+
+
+def is_irreflexive(matrix):
+    if isinstance(matrix, BitRelation):
+        return not matrix.diagonal().any()
+    return not np.diagonal(matrix).any()
+
+
+def is_symmetric(matrix, block_rows=None):
+    """M == M^T, сравнение полосами строк с выходом на первом несовпадении"""
+    if isinstance(matrix, BitRelation):
+        return matrix == matrix.T
+    matrix = np.asarray(matrix, dtype=bool)
+    for r0, r1 in _row_blocks(len(matrix), block_rows):
+        if not np.array_equal(matrix[r0:r1], matrix[:, r0:r1].T):
+            return False
+    return True
+
+
+def is_antisymmetric(matrix, block_rows=None):
+    """M & M^T не содержит пар вне диагонали"""
+    if isinstance(matrix, BitRelation):
+        both = matrix & matrix.T
+        both.clear_diagonal()
+        return not both.any()
+    matrix = np.asarray(matrix, dtype=bool)
+    for r0, r1 in _row_blocks(len(matrix), block_rows):
+        both = matrix[r0:r1] & matrix[:, r0:r1].T
+        idx = np.arange(r1 - r0)
+        both[idx, r0 + idx] = False
+        if both.any():
+            return False
+    return True
+
+
+def is_transitive(matrix, block_rows=None):
+    """M∘M ⊆ M: булево произведение полосами строк, выход на первом контрпримере.
+    Копии float32 для BLAS строятся по блокам, а не для всей матрицы n x n"""
+    if isinstance(matrix, BitRelation):
+        for k in range(matrix.n):  # строки i с парой (i, k) должны содержать всю строку k
+            rows = matrix.words[matrix.column(k)]
+            if (matrix.words[k] & ~rows).any():
+                return False
+        return True
+    matrix = np.asarray(matrix, dtype=bool)
+    n = len(matrix)
+    for r0, r1 in _row_blocks(n, block_rows):
+        left = matrix[r0:r1].astype(np.float32)  # BLAS-умножение; нам важно только > 0
+        square = np.zeros((r1 - r0, n), dtype=np.float32)
+        for k0, k1 in _row_blocks(n, max(1, BLOCK_ELEMS // max(n, 1))):
+            square += left[:, k0:k1] @ matrix[k0:k1].astype(np.float32)  # float32 - только по блокам
+        if ((square > 0) & ~matrix[r0:r1]).any():
+            return False
+    return True
+
+
+PROPERTIES = {
+    'рефлексивное': is_reflexive,
+    'антирефлексивное': is_irreflexive,
+    'симметричное': is_symmetric,
+    'антисимметричное': is_antisymmetric,
+    'транзитивное': is_transitive
+}
+
+
+def relation_properties(matrix, names=None):
+    """Свойства отношения по матрице или BitRelation; names - какие проверять"""
+    if names is None:
+        names = PROPERTIES
+    return {name: PROPERTIES[name](matrix) for name in names}
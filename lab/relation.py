@@ -0,0 +1,117 @@
+import numpy as np
+from bitrel import BLOCK_ELEMS, BitRelation, pack_rows
+
+
+class Relation:
+    """Отношение на универсуме X, заданное предикатом; пары не хранятся.
+    vectorized(xs, ys) - необязательная numpy-версия предиката для построения матрицы"""
+
+    def __init__(self, universe, predicate, vectorized=None):
+        self.universe = list(universe)
+        self.predicate = predicate
+        self.vectorized = vectorized
+        self.left = None
+        self.right = None
+        self._members = set(self.universe)
+
+    @classmethod
+    def product(cls, universe, left, right):
+        """Разделимое отношение: x R y ⇔ left(x) и right(y)"""
+        rel = cls(universe, lambda x, y: bool(left(x) and right(y)))
+        rel.left = left
+        rel.right = right
+        return rel
+
+    @property
+    def separable(self):
+        return self.left is not None
+
+    def __contains__(self, pair):
+        x, y = pair
+        return x in self._members and y in self._members and bool(self.predicate(x, y))
+
+    def __iter__(self):
+        if self.separable:
+            ys = [y for y in self.universe if self.right(y)]
+            for x in self.universe:
+                if self.left(x):
+                    for y in ys:
+                        yield (x, y)
+            return
+        for x in self.universe:
+            for y in self.universe:
+                if self.predicate(x, y):
+                    yield (x, y)
+
+    def pairs(self):
+        return iter(self)
+
+    def _masks(self):
+        left = np.array([bool(self.left(x)) for x in self.universe], dtype=bool)
+        right = np.array([bool(self.right(y)) for y in self.universe], dtype=bool)
+        return left, right
+
+    def blocks(self):
+        """Полосы строк матрицы отношения: (r0, r1, булев блок)"""
+        n = len(self.universe)
+        step = max(1, BLOCK_ELEMS // max(n, 1))
+        if self.separable:
+            left, right = self._masks()
+        elif self.vectorized is not None:
+            xs = np.asarray(self.universe)
+        for r0 in range(0, n, step):
+            r1 = min(n, r0 + step)
+            if self.separable:
+                block = np.outer(left[r0:r1], right)
+            elif self.vectorized is not None:
+                block = np.asarray(self.vectorized(xs[r0:r1, None], xs[None, :]), dtype=bool)
+            else:
+                block = np.array([[bool(self.predicate(x, y)) for y in self.universe]
+                                  for x in self.universe[r0:r1]], dtype=bool).reshape(r1 - r0, n)
+            yield r0, r1, block
+
+    def __len__(self):
+        if self.separable:
+            left, right = self._masks()
+            return int(left.sum()) * int(right.sum())
+        return sum(int(block.sum()) for _, _, block in self.blocks())
+
+    def to_matrix(self, dtype=int):
+        """Матрица отношения; строка i соответствует universe[i]"""
+        n = len(self.universe)
+        matrix = np.zeros((n, n), dtype=dtype)
+        for r0, r1, block in self.blocks():
+            matrix[r0:r1] = block
+        return matrix
+
+    def to_bits(self):
+        """То же в виде BitRelation, без плотной матрицы целиком"""
+        rel = BitRelation(len(self.universe))
+        for r0, r1, block in self.blocks():
+            rel.words[r0:r1] = pack_rows(block, rel.n_words)
+        return rel
+
+    def domain(self):
+        if self.separable:
+            left, right = self._masks()
+            if not right.any():
+                return set()
+            return {x for x, ok in zip(self.universe, left) if ok}
+        rows = np.zeros(len(self.universe), dtype=bool)
+        for r0, r1, block in self.blocks():
+            rows[r0:r1] = block.any(axis=1)
+        return {x for x, ok in zip(self.universe, rows) if ok}
+
+    def range(self):
+        if self.separable:
+            left, right = self._masks()
+            if not left.any():
+                return set()
+            return {y for y, ok in zip(self.universe, right) if ok}
+        cols = np.zeros(len(self.universe), dtype=bool)
+        for _, _, block in self.blocks():
+            cols |= block.any(axis=0)
+        return {y for y, ok in zip(self.universe, cols) if ok}
+
+    def __repr__(self):
+        return f"Relation(|X|={len(self.universe)})"
@@ -0,0 +1,71 @@
+"""Рисование графов: общие раскладки для производных графов и пакетная запись в файлы.
+
+Раскладка (положения вершин) хранится в LayoutCache, который граф передаёт графам,
+полученным из него операциями, - у них вершины остаются на прежних местах,
+а spring_layout считает положения только для новых вершин.
+render_many рисует много графов в файлы в пуле процессов с бэкендом Agg.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+import matplotlib.pyplot as plt
+import networkx as nx
+
+STYLE = dict(with_labels=True, node_color='lightblue', node_size=800, font_size=12,
+             font_weight='bold', edge_color='gray', linewidths=1, alpha=0.7)
+
+
+class LayoutCache:
+    """Положения вершин, общие для графа и производных от него графов"""
+
+    def __init__(self, seed=42):
+        self.seed = seed
+        self.positions = {}
+
+    def merge(self, other):
+        """Положения вершин other, которых здесь ещё нет"""
+        for v, p in other.positions.items():
+            self.positions.setdefault(v, p)
+
+    def layout(self, vertices, edges):
+        G = nx.Graph()
+        G.add_nodes_from(vertices)
+        G.add_edges_from(edges)
+        known = {v: self.positions[v] for v in G if v in self.positions}
+        if len(known) < len(G):  # известные вершины закреплены, считаются только новые
+            self.positions.update(nx.spring_layout(G, pos=known or None, fixed=list(known) or None,
+                                                   seed=self.seed))
+        return {v: self.positions[v] for v in G}
+
+
+def figure(vertices, edges, pos, name):
+    """Рисунок графа с готовыми положениями вершин"""
+    G = nx.Graph()
+    G.add_nodes_from(vertices)
+    G.add_edges_from(edges)
+    fig = plt.figure(figsize=(8, 6))
+    nx.draw(G, pos, **STYLE)
+    plt.title(f'Граф {name}')
+    plt.axis('off')
+    plt.tight_layout()
+    return fig
+
+
+def _init_worker():
+    matplotlib.use('Agg', force=True)  # без окон: только запись в файлы
+
+
+def _render(job):
+    vertices, edges, pos, name, path, dpi = job
+    fig = figure(vertices, edges, pos, name)
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+def render_many(graphs, paths, workers=None, dpi=150):
+    """Рисунки графов в файлы paths; раскладки считаются здесь (из кэшей графов),
+    рисование и запись - в процессах пула. Возвращает пути записанных файлов"""
+    jobs = [(list(g.vertices), list(g.edges), g.layout_cache.layout(g.vertices, g.edges), g.name, path, dpi)
+            for g, path in zip(graphs, paths)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_render, jobs))
@@ -0,0 +1,177 @@
+"""Кратчайший замкнутый маршрут (задача коммивояжёра) по матрице расстояний numpy.
+
+held_karp - точная динамика по подмножествам, O(2^n n^2), до HELD_KARP_MAX вершин;
+branch_and_bound - для задач крупнее: поиск в глубину с нижней оценкой по приведённой матрице
+(сумма минимумов строк и столбцов) и ограничением числа узлов; score_routes - длины многих
+маршрутов разом. solve_route выбирает между ними по размеру.
+Матрица может быть несимметричной; маршрут - список номеров вершин от start до start.
+"""
+import numpy as np
+
+HELD_KARP_MAX = 20  # таблица dp на 2^(n-1) x (n-1) значений удваивается с каждой вершиной
+BB_MAX_NODES = 20_000  # узлов перебора с отсечением по умолчанию
+
+
+def score_routes(dist, routes):
+    """Длины маршрутов: routes - массив (m, L) номеров вершин, длина - сумма дуг подряд"""
+    dist = np.asarray(dist)
+    routes = np.asarray(routes)
+    return dist[routes[:, :-1], routes[:, 1:]].sum(axis=1)
+
+
+def route_length(dist, route: list):
+    """Длина одного маршрута (число того же типа, что и расстояния)"""
+    return score_routes(dist, [route])[0].item()
+
+
+def held_karp(dist, start: int = 0) -> tuple:
+    """Точный кратчайший маршрут: dp[S, j] - длина кратчайшего пути из start через
+    множество S (биты - остальные вершины), заканчивающегося в j. Слои S по числу элементов,
+    внутри слоя - векторно по всем S сразу для каждой последней вершины j"""
+    dist = np.asarray(dist)
+    n = len(dist)
+    if n <= 1:
+        return 0, [start] * 2 if n else []
+    others = np.array([v for v in range(n) if v != start])
+    m = n - 1
+    d = dist[np.ix_(others, others)].astype(float)  # d[a, b] - дуга между others[a] и others[b]
+    full = 1 << m
+    dp = np.full((full, m), np.inf)
+    parent = np.full((full, m), -1, dtype=np.int8)
+    bits = 1 << np.arange(m)
+    dp[bits, np.arange(m)] = dist[start, others]
+    masks = np.arange(full)
+    size = np.zeros(full, dtype=np.int64)
+    for b in range(m):
+        size += (masks >> b) & 1
+    for s in range(2, m + 1):
+        layer = masks[size == s]
+        for j in range(m):
+            target = layer[(layer >> j) & 1 == 1]
+            source = target ^ (1 << j)
+            candidates = dp[source] + d[:, j]  # строка source, вершина перед j - по столбцам
+            best = np.argmin(candidates, axis=1)
+            dp[target, j] = candidates[np.arange(len(target)), best]
+            parent[target, j] = best
+    closing = dp[full - 1] + dist[others, start]
+    j = int(np.argmin(closing))
+    route = []
+    mask = full - 1
+    while j >= 0:
+        route.append(int(others[j]))
+        mask, j = mask ^ (1 << j), int(parent[mask, j])
+    route = [start] + route[::-1] + [start]
+    return route_length(dist, route), route
+
+
+def _reduce(matrix):
+    """Приведение строк и столбцов (без строк/столбцов из одних inf); возвращает сумму вычтенного"""
+    row = matrix.min(axis=1)
+    row[np.isinf(row)] = 0
+    matrix -= row[:, None]
+    col = matrix.min(axis=0)
+    col[np.isinf(col)] = 0
+    matrix -= col[None, :]
+    return row.sum() + col.sum()
+
+
+def _nearest_neighbor(dist, start):
+    """Жадный маршрут: каждый раз в ближайшую непосещённую вершину"""
+    n = len(dist)
+    route = [start]
+    left = set(range(n)) - {start}
+    while left:
+        here = route[-1]
+        nxt = min(left, key=lambda v: dist[here, v])
+        route.append(nxt)
+        left.remove(nxt)
+    return route + [start]
+
+
+def two_opt(dist, route: list) -> list:
+    """Улучшение маршрута разворотами отрезков: все развороты одного шага
+    оцениваются разом через score_routes, берётся лучший, пока он короче"""
+    route = np.array(route)
+    n = len(route) - 1
+    i, j = np.triu_indices(n, 1)
+    keep = i > 0  # разворот route[i..j], start на концах не двигается
+    i, j = i[keep], j[keep]
+    if not len(i):
+        return route.tolist()
+    positions = np.tile(np.arange(n + 1), (len(i), 1))
+    inside = (positions >= i[:, None]) & (positions <= j[:, None])
+    mirrored = (i + j)[:, None] - positions
+    positions = np.where(inside, mirrored, positions)
+    length = route_length(dist, route.tolist())
+    while True:
+        candidates = route[positions]
+        lengths = score_routes(dist, candidates)
+        best = int(np.argmin(lengths))
+        if lengths[best] >= length:
+            return route.tolist()
+        route, length = candidates[best], lengths[best]
+
+
+def branch_and_bound(dist, start: int = 0, max_nodes: int = BB_MAX_NODES) -> tuple:
+    """Кратчайший маршрут перебором в глубину с отсечением: узел - частичный путь
+    и приведённая матрица, нижняя оценка - цена пути плюс сумма приведений.
+    Начальный рекорд - жадный маршрут, улучшенный two_opt; дети идут по возрастанию оценки,
+    в памяти только дети узлов текущей ветви (глубина не больше n, до n^4 чисел).
+    Больше max_nodes узлов не раскрывается (None - без ограничения).
+    Возвращает (длина, маршрут, proven_optimal); proven_optimal = False - бюджет узлов
+    исчерпан и маршрут лишь лучший из найденных"""
+    dist = np.asarray(dist)
+    n = len(dist)
+    if n <= 1:
+        return 0, [start] * 2 if n else [], True
+    best_route = two_opt(dist, _nearest_neighbor(dist, start))
+    best = route_length(dist, best_route)
+    root = dist.astype(float)
+    np.fill_diagonal(root, np.inf)
+    path = [start]
+    nodes = 0
+    exhausted = False
+
+    def walk(matrix, bound):
+        nonlocal best, best_route, nodes, exhausted
+        here = path[-1]
+        if len(path) == n:
+            cost = route_length(dist, path + [start])
+            if cost < best:
+                best, best_route = cost, path + [start]
+            return
+        children = []
+        for nxt in np.flatnonzero(np.isfinite(matrix[here])):
+            nxt = int(nxt)
+            if nxt == start:
+                continue
+            child = matrix.copy()
+            child[here, :] = np.inf
+            child[:, nxt] = np.inf
+            if len(path) + 1 < n:
+                child[nxt, start] = np.inf  # вернуться в start можно только последним шагом
+            children.append((bound + matrix[here, nxt] + _reduce(child), nxt, child))
+        children.sort(key=lambda c: c[0])
+        for child_bound, nxt, child in children:
+            if child_bound >= best:
+                return
+            if max_nodes is not None and nodes >= max_nodes:
+                exhausted = True
+                return
+            nodes += 1
+            path.append(nxt)
+            walk(child, child_bound)
+            path.pop()
+
+    bound = _reduce(root)
+    if bound < best:
+        walk(root, bound)
+    return best, best_route, not exhausted
+
+
+def solve_route(dist, start: int = 0, max_nodes: int = BB_MAX_NODES) -> tuple:
+    """Кратчайший маршрут: (длина, маршрут, proven_optimal). До HELD_KARP_MAX вершин -
+    held_karp (всегда точно), больше - branch_and_bound с бюджетом max_nodes узлов"""
+    if len(dist) <= HELD_KARP_MAX:
+        return held_karp(dist, start) + (True,)
+    return branch_and_bound(dist, start, max_nodes)
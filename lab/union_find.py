@@ -0,0 +1,81 @@
+class DisjointSet:
+    """Система непересекающихся множеств (union-find) со сжатием путей и объединением по рангу:
+    поиск и объединение за O(alpha(n)), count - число множеств"""
+
+    def __init__(self, items=()):
+        self.parent = {}
+        self.rank = {}
+        self.count = 0
+        for x in items:
+            self.add(x)
+
+    @classmethod
+    def from_labels(cls, items, labels):
+        """По готовым меткам компонент: элементы с одной меткой - одно множество"""
+        ds = cls()
+        roots = {}
+        for x, label in zip(items, labels):
+            root = roots.setdefault(label, x)
+            ds.parent[x] = root
+            ds.rank[x] = 1 if root == x else 0
+        ds.count = len(roots)
+        return ds
+
+    def copy(self):
+        ds = DisjointSet()
+        ds.parent = dict(self.parent)
+        ds.rank = dict(self.rank)
+        ds.count = self.count
+        return ds
+
+    def __contains__(self, x):
+        return x in self.parent
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self, x):
+        if x not in self.parent:
+            self.parent[x] = x
+            self.rank[x] = 0
+            self.count += 1
+
+    def find(self, x):
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:  # сжатие пути
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a, b):
+        """Объединение множеств a и b; False, если они уже были одним"""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        self.count -= 1
+        return True
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+    def merge(self, other):
+        """Добавление множеств other (элементы, попавшие в оба, склеивают множества)"""
+        for x in other.parent:
+            root = other.find(x)
+            self.add(x)
+            self.add(root)
+            self.union(x, root)
+        return self
+
+    def groups(self, items):
+        """Множества как списки items в порядке первого элемента"""
+        groups = {}
+        for x in items:
+            groups.setdefault(self.find(x), []).append(x)
+        return list(groups.values())